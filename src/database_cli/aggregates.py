@@ -0,0 +1,121 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "avg", "min", "max")
+_NUMERIC_TYPES = ("int", "float")
+
+
+def aggregate_label(func: str, column: Optional[str]) -> str:
+    return f"{func}({column or '*'})"
+
+
+def validate_aggregates(
+    aggregates: List[Tuple[str, Optional[str]]],
+    schema: Dict[str, Any],
+    group_by: Optional[str],
+) -> None:
+    if group_by is not None and group_by not in schema["positions"]:
+        raise KeyError(f"Столбец '{group_by}' не найден")
+
+    for func, column in aggregates:
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Неизвестная агрегатная функция: {func}")
+        if column is None:
+            if func != "count":
+                raise ValueError(f"Функция {func} требует столбец")
+            continue
+        if column not in schema["positions"]:
+            raise KeyError(f"Столбец '{column}' не найден")
+        if func in ("sum", "avg") and schema["types"][column] not in _NUMERIC_TYPES:
+            raise ValueError(
+                f"Функция {func} применима только к числовым столбцам, "
+                f"а '{column}' имеет тип {schema['types'][column]}"
+            )
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_present(value: Any) -> bool:
+    return value is not None and value != ""
+
+
+def _step_count(state: int, value: Any) -> int:
+    return state + 1 if _is_present(value) else state
+
+
+def _step_sum(state: Optional[float], value: Any) -> Optional[float]:
+    if not _is_number(value):
+        return state
+    return value if state is None else state + value
+
+
+def _step_avg(state: List[float], value: Any) -> List[float]:
+    if _is_number(value):
+        state[0] += value
+        state[1] += 1
+    return state
+
+
+def _step_min(state: Any, value: Any) -> Any:
+    if not _is_present(value):
+        return state
+    try:
+        return value if state is None or value < state else state
+    except TypeError:
+        return state
+
+
+def _step_max(state: Any, value: Any) -> Any:
+    if not _is_present(value):
+        return state
+    try:
+        return value if state is None or value > state else state
+    except TypeError:
+        return state
+
+
+_STEPS = {
+    "count": _step_count,
+    "sum": _step_sum,
+    "avg": _step_avg,
+    "min": _step_min,
+    "max": _step_max,
+}
+
+
+def initial_states(funcs: List[str]) -> List[Any]:
+    return [
+        0 if func == "count" else [0, 0] if func == "avg" else None
+        for func in funcs
+    ]
+
+
+def fold_aggregates(
+    funcs: List[str],
+    rows: Iterable[Tuple[Any, ...]],
+    grouped: bool,
+) -> Dict[Any, List[Any]]:
+    steps = [_STEPS[func] for func in funcs]
+    groups: Dict[Any, List[Any]] = {}
+
+    for row in rows:
+        key = row[0] if grouped else None
+        values = row[1:] if grouped else row
+        states = groups.get(key)
+        if states is None:
+            states = groups[key] = initial_states(funcs)
+        for i, (step, value) in enumerate(zip(steps, values, strict=True)):
+            states[i] = step(states[i], value)
+
+    return groups
+
+
+def finish_states(funcs: List[str], states: List[Any]) -> List[Any]:
+    result = []
+    for func, state in zip(funcs, states, strict=True):
+        if func == "avg":
+            result.append(state[0] / state[1] if state[1] else None)
+        else:
+            result.append(state)
+    return result
@@ -0,0 +1,3 @@
+from .runner import compare_results, main, run_benchmarks
+
+__all__ = ["compare_results", "main", "run_benchmarks"]
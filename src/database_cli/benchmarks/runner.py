@@ -0,0 +1,304 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from prettytable import PrettyTable
+
+from .workloads import DEFAULT_SCHEMA, WORKLOADS, parse_schema, setup_table
+
+try:
+    from ..core import clear_cache
+    from ..decorators import set_auto_confirm
+    from ..utils import checkpoint, invalidate_table_cache
+except ImportError:
+    from core import clear_cache
+    from decorators import set_auto_confirm
+    from utils import checkpoint, invalidate_table_cache
+
+RESULT_VERSION = 1
+DEFAULT_ROWS = 10_000
+DEFAULT_OPS = 200
+DEFAULT_SEED = 42
+DEFAULT_MAX_REGRESSION = 0.2
+PERCENTILES = (50, 90, 95, 99)
+_CONFIG_KEYS = ("rows", "ops", "io_ops", "schema", "storage", "seed", "sync")
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(latencies: List[float]) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    summary = {
+        "ops": len(ordered),
+        "seconds": round(total, 6),
+        "ops_per_sec": round(len(ordered) / total, 2) if total else 0.0,
+        "mean_ms": round(total / len(ordered) * 1000, 4) if ordered else 0.0,
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = round(percentile(ordered, q) * 1000, 4)
+    summary["max_ms"] = round(ordered[-1] * 1000, 4) if ordered else 0.0
+    return summary
+
+
+def run_benchmarks(
+    rows: int = DEFAULT_ROWS,
+    ops: int = DEFAULT_OPS,
+    schema: str = DEFAULT_SCHEMA,
+    storage: str = "json",
+    seed: int = DEFAULT_SEED,
+    sync: bool = True,
+    workloads: Optional[List[str]] = None,
+    io_ops: Optional[int] = None,
+    keep_data: bool = False,
+) -> Dict[str, Any]:
+    workloads = list(WORKLOADS) if workloads is None else workloads
+    unknown = [name for name in workloads if name not in WORKLOADS]
+    if unknown:
+        raise ValueError(
+            f"Неизвестные нагрузки: {', '.join(unknown)}. "
+            f"Доступны: {', '.join(WORKLOADS)}"
+        )
+    if rows < 1 or ops < 1:
+        raise ValueError("Число строк и операций должно быть положительным")
+
+    config = {
+        "rows": rows,
+        "ops": ops,
+        "io_ops": max(1, ops // 10) if io_ops is None else io_ops,
+        "schema": schema,
+        "storage": storage,
+        "seed": seed,
+        "sync": sync,
+        "workloads": workloads,
+    }
+    context = {
+        **config,
+        "schema": parse_schema(schema),
+        "metadata": {},
+        "rng": random.Random(seed),
+    }
+
+    original_dir = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="database-bench-")
+    os.chdir(work_dir)
+    invalidate_table_cache()
+    clear_cache()
+    set_auto_confirm(True)
+    results = {}
+    try:
+        start = time.perf_counter()
+        setup_table(context)
+        setup_seconds = time.perf_counter() - start
+
+        for name in workloads:
+            print(f"Нагрузка {name}...", file=sys.stderr)
+            results[name] = summarize(WORKLOADS[name](context))
+    finally:
+        checkpoint()
+        invalidate_table_cache()
+        clear_cache()
+        os.chdir(original_dir)
+        if keep_data:
+            print(f"Данные бенчмарка сохранены в {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "version": RESULT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": config,
+        "setup_seconds": round(setup_seconds, 6),
+        "results": results,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: float = DEFAULT_MAX_REGRESSION,
+) -> Dict[str, Any]:
+    workloads = {}
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+
+        throughput = (
+            result["ops_per_sec"] / base["ops_per_sec"] - 1
+            if base["ops_per_sec"] else 0.0
+        )
+        p95 = result["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        workloads[name] = {
+            "ops_per_sec_change": round(throughput, 4),
+            "p95_change": round(p95, 4),
+            "regression": throughput < -max_regression or p95 > max_regression,
+        }
+
+    return {
+        "max_regression": max_regression,
+        "config_mismatch": [
+            key for key in _CONFIG_KEYS
+            if current["config"].get(key) != baseline.get("config", {}).get(key)
+        ],
+        "workloads": workloads,
+        "regressions": [
+            name for name, change in workloads.items() if change["regression"]
+        ],
+    }
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    changes = report.get("comparison", {}).get("workloads", {})
+    table = PrettyTable()
+    table.field_names = [
+        "нагрузка", "операций", "оп/с", "p50, мс", "p95, мс", "p99, мс",
+        "к базовому, оп/с",
+    ]
+    for name, result in report["results"].items():
+        change = changes.get(name)
+        table.add_row([
+            name,
+            result["ops"],
+            result["ops_per_sec"],
+            result["p50_ms"],
+            result["p95_ms"],
+            result["p99_ms"],
+            f"{change['ops_per_sec_change']:+.1%}" if change else "",
+        ])
+    print(table)
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="database bench",
+        description="Замеры производительности основных операций базы данных",
+    )
+    parser.add_argument(
+        "--rows", type=int, default=DEFAULT_ROWS,
+        help=f"строк в синтетической таблице (по умолчанию {DEFAULT_ROWS})",
+    )
+    parser.add_argument(
+        "--ops", type=int, default=DEFAULT_OPS,
+        help=f"операций в каждой нагрузке (по умолчанию {DEFAULT_OPS})",
+    )
+    parser.add_argument(
+        "--io-ops", type=int,
+        help="повторов загрузки и сохранения таблицы (по умолчанию ops / 10)",
+    )
+    parser.add_argument(
+        "--schema", default=DEFAULT_SCHEMA,
+        help=f"столбцы таблицы имя:тип через запятую (по умолчанию {DEFAULT_SCHEMA})",
+    )
+    parser.add_argument(
+        "--storage", choices=["json", "columnar", "rows"], default="json",
+        help="формат хранения таблицы",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=DEFAULT_SEED,
+        help="зерно генератора данных и запросов",
+    )
+    parser.add_argument(
+        "--workloads",
+        help=f"нагрузки через запятую: {', '.join(WORKLOADS)} (по умолчанию все)",
+    )
+    parser.add_argument(
+        "--no-sync", action="store_true",
+        help="не выполнять fsync журнала после каждой операции",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="записать результат в JSON-файл (иначе JSON выводится в stdout)",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="JSON-файл с результатами прошлого запуска для сравнения",
+    )
+    parser.add_argument(
+        "--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+        help="допустимое ухудшение относительно базового запуска (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--keep-data", action="store_true",
+        help="не удалять временный каталог с данными",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    workloads = None
+    if args.workloads:
+        workloads = [
+            name.strip() for name in args.workloads.split(",") if name.strip()
+        ]
+
+    try:
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+
+        report = run_benchmarks(
+            rows=args.rows,
+            ops=args.ops,
+            schema=args.schema,
+            storage=args.storage,
+            seed=args.seed,
+            sync=not args.no_sync,
+            workloads=workloads,
+            io_ops=args.io_ops,
+            keep_data=args.keep_data,
+        )
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Ошибка бенчмарка: {e}", file=sys.stderr)
+        return 2
+
+    if baseline is not None:
+        report["comparison"] = compare_results(
+            report, baseline, args.max_regression
+        )
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print_summary(report)
+        print(f"Результаты записаны в '{args.output}'.")
+    else:
+        print(text)
+
+    comparison = report.get("comparison")
+    if comparison is None:
+        return 0
+    if comparison["config_mismatch"]:
+        print(
+            "Предупреждение: параметры отличаются от базового запуска: "
+            + ", ".join(comparison["config_mismatch"]),
+            file=sys.stderr,
+        )
+    if comparison["regressions"]:
+        print(
+            "Ухудшение производительности: " + ", ".join(comparison["regressions"]),
+            file=sys.stderr,
+        )
+        return 1
+    return 0
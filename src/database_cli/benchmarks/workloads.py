@@ -0,0 +1,205 @@
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    from ..core import (
+        clear_cache,
+        create_table,
+        delete,
+        insert,
+        insert_many,
+        select,
+        set_storage,
+        update,
+    )
+    from ..stats import flush_table_stats
+    from ..utils import (
+        commit_changes,
+        invalidate_table_cache,
+        load_table_data,
+        save_table_data,
+    )
+except ImportError:
+    from core import (
+        clear_cache,
+        create_table,
+        delete,
+        insert,
+        insert_many,
+        select,
+        set_storage,
+        update,
+    )
+    from stats import flush_table_stats
+    from utils import (
+        commit_changes,
+        invalidate_table_cache,
+        load_table_data,
+        save_table_data,
+    )
+
+BENCH_TABLE = "bench"
+DEFAULT_SCHEMA = "name:str,age:int,score:float,active:bool"
+SETUP_BATCH_ROWS = 5000
+SUPPORTED_TYPES = ("int", "float", "str", "bool")
+
+Context = Dict[str, Any]
+
+
+def parse_schema(spec: str) -> List[Tuple[str, str]]:
+    columns = []
+    for item in spec.split(","):
+        name, _, col_type = item.strip().partition(":")
+        col_type = col_type.strip().lower() or "str"
+        if not name.strip().isidentifier() or name.strip() == "ID":
+            raise ValueError(f"Недопустимое имя столбца в схеме: '{item.strip()}'")
+        if col_type not in SUPPORTED_TYPES:
+            raise ValueError(
+                f"Неподдерживаемый тип '{col_type}'. "
+                f"Доступны: {', '.join(SUPPORTED_TYPES)}"
+            )
+        columns.append((name.strip(), col_type))
+    if not columns:
+        raise ValueError("Схема таблицы не содержит столбцов")
+    return columns
+
+
+def _random_value(rng: random.Random, col_type: str, rows: int) -> str:
+    if col_type == "int":
+        return str(rng.randrange(max(rows, 1)))
+    if col_type == "float":
+        return f"{rng.random() * 1000:.3f}"
+    if col_type == "bool":
+        return rng.choice(("true", "false"))
+    return f"s{rng.randrange(max(rows, 1))}"
+
+
+def random_row(context: Context) -> List[str]:
+    return [
+        _random_value(context["rng"], col_type, context["rows"])
+        for _, col_type in context["schema"]
+    ]
+
+
+def _command(context: Context, func: Callable[..., Any], *args: Any) -> float:
+    start = time.perf_counter()
+    result = func(*args)
+    if context["sync"]:
+        flush_table_stats()
+        commit_changes()
+    elapsed = time.perf_counter() - start
+    if result is None:
+        raise RuntimeError("Операция бенчмарка завершилась с ошибкой")
+    return elapsed
+
+
+def setup_table(context: Context) -> None:
+    metadata = context["metadata"]
+    columns = [f"{name} {col_type}" for name, col_type in context["schema"]]
+    create_table(metadata, BENCH_TABLE, columns)
+
+    for start in range(0, context["rows"], SETUP_BATCH_ROWS):
+        count = min(SETUP_BATCH_ROWS, context["rows"] - start)
+        insert_many(
+            metadata, BENCH_TABLE, [random_row(context) for _ in range(count)]
+        )
+    if context["storage"] != "json":
+        set_storage(metadata, BENCH_TABLE, context["storage"])
+    flush_table_stats()
+    commit_changes()
+
+
+def _existing_ids() -> List[int]:
+    return [record["ID"] for record in load_table_data(BENCH_TABLE)]
+
+
+def _select_rows(metadata: Dict[str, Any], where: Dict[str, str]) -> Any:
+    rows = select(metadata, BENCH_TABLE, where)
+    return None if rows is None else list(rows)
+
+
+def bench_insert(context: Context) -> List[float]:
+    latencies = []
+    for _ in range(context["ops"]):
+        row = random_row(context)
+        latencies.append(
+            _command(context, insert, context["metadata"], BENCH_TABLE, row)
+        )
+    return latencies
+
+
+def bench_point_select(context: Context) -> List[float]:
+    ids = _existing_ids()
+    latencies = []
+    for _ in range(context["ops"]):
+        where = {"ID": str(context["rng"].choice(ids))}
+        latencies.append(
+            _command(context, _select_rows, context["metadata"], where)
+        )
+    return latencies
+
+
+def bench_full_scan(context: Context) -> List[float]:
+    name, col_type = context["schema"][0]
+    latencies = []
+    for _ in range(context["ops"]):
+        clear_cache()
+        where = {name: _random_value(context["rng"], col_type, context["rows"])}
+        latencies.append(
+            _command(context, _select_rows, context["metadata"], where)
+        )
+    return latencies
+
+
+def bench_update(context: Context) -> List[float]:
+    name, col_type = context["schema"][0]
+    ids = _existing_ids()
+    latencies = []
+    for _ in range(context["ops"]):
+        where = {"ID": str(context["rng"].choice(ids))}
+        values = {name: _random_value(context["rng"], col_type, context["rows"])}
+        latencies.append(_command(
+            context, update, context["metadata"], BENCH_TABLE, values, where
+        ))
+    return latencies
+
+
+def bench_delete(context: Context) -> List[float]:
+    ids = _existing_ids()
+    latencies = []
+    for key in context["rng"].sample(ids, min(context["ops"], len(ids))):
+        where = {"ID": str(key)}
+        latencies.append(
+            _command(context, delete, context["metadata"], BENCH_TABLE, where)
+        )
+    return latencies
+
+
+def bench_load(context: Context) -> List[float]:
+    latencies = []
+    for _ in range(context["io_ops"]):
+        invalidate_table_cache()
+        latencies.append(_command(context, load_table_data, BENCH_TABLE))
+    return latencies
+
+
+def bench_save(context: Context) -> List[float]:
+    data = load_table_data(BENCH_TABLE)
+    latencies = []
+    for _ in range(context["io_ops"]):
+        start = time.perf_counter()
+        save_table_data(BENCH_TABLE, data)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+WORKLOADS: Dict[str, Callable[[Context], List[float]]] = {
+    "insert": bench_insert,
+    "point_select": bench_point_select,
+    "full_scan": bench_full_scan,
+    "update": bench_update,
+    "delete": bench_delete,
+    "load": bench_load,
+    "save": bench_save,
+}
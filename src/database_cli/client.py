@@ -0,0 +1,150 @@
+import json
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7437
+TRANSACTION_COMMANDS = ("begin", "commit", "rollback")
+
+
+class DatabaseClient:
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        pool_size: int = 4,
+        timeout: Optional[float] = None,
+    ):
+        if pool_size < 1:
+            raise ValueError("Размер пула должен быть положительным")
+
+        self._socket_path = socket_path
+        self._address = (host, port)
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._idle: List[Tuple[socket.socket, object]] = []
+        self._opened = 0
+        self._available = threading.Condition()
+
+    def _connect(self) -> Tuple[socket.socket, object]:
+        if self._socket_path is not None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self._timeout)
+            sock.connect(self._socket_path)
+        else:
+            sock = socket.create_connection(self._address, self._timeout)
+        return sock, sock.makefile('rb')
+
+    def _acquire(self) -> Tuple[socket.socket, object]:
+        with self._available:
+            while not self._idle and self._opened >= self._pool_size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+
+        try:
+            return self._connect()
+        except OSError:
+            with self._available:
+                self._opened -= 1
+                self._available.notify()
+            raise
+
+    def _discard(self, connection: Tuple[socket.socket, object]) -> None:
+        sock, reader = connection
+        reader.close()
+        sock.close()
+        with self._available:
+            self._opened -= 1
+            self._available.notify()
+
+    def _request(
+        self,
+        connection: Tuple[socket.socket, object],
+        command: str,
+    ) -> Dict[str, Any]:
+        sock, reader = connection
+        request = json.dumps({"command": command}, ensure_ascii=False) + "\n"
+        sock.sendall(request.encode())
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Сервер закрыл соединение")
+        return json.loads(line)
+
+    def _release(
+        self,
+        connection: Tuple[socket.socket, object],
+        response: Optional[Dict[str, Any]],
+    ) -> None:
+        if response is None or response.get("closed"):
+            self._discard(connection)
+        else:
+            with self._available:
+                self._idle.append(connection)
+                self._available.notify()
+
+    def _rollback(
+        self,
+        connection: Tuple[socket.socket, object],
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            response = self._request(connection, "rollback")
+        except (OSError, ValueError):
+            return None
+        return None if response.get("transaction") else response
+
+    @staticmethod
+    def _output(response: Dict[str, Any]) -> str:
+        if not response["ok"]:
+            raise RuntimeError(response.get("error") or response["output"])
+        return response["output"]
+
+    def execute(self, command: str) -> str:
+        if command.strip().lower() in TRANSACTION_COMMANDS:
+            raise ValueError(
+                "Команды транзакций выполняются только внутри session()"
+            )
+
+        connection = self._acquire()
+        response = None
+        try:
+            response = self._request(connection, command)
+        finally:
+            if response is not None and response.get("transaction"):
+                response = self._rollback(connection)
+            self._release(connection, response)
+        return self._output(response)
+
+    @contextmanager
+    def session(self) -> Iterator[Callable[[str], str]]:
+        connection = self._acquire()
+        state = {"response": {}}
+
+        def execute(command: str) -> str:
+            state["response"] = None
+            state["response"] = self._request(connection, command)
+            return self._output(state["response"])
+
+        try:
+            yield execute
+        finally:
+            response = state["response"]
+            if response is not None and response.get("transaction"):
+                response = self._rollback(connection)
+            self._release(connection, response)
+
+    def close(self) -> None:
+        with self._available:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+    def __enter__(self) -> "DatabaseClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
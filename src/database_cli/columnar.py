@@ -0,0 +1,192 @@
+import json
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"DBCOL001"
+_TYPECODES = {"int": "q", "float": "d", "bool": "b"}
+_STR_CODE = "I"
+
+
+def _matches_type(value: Any, col_type: str) -> bool:
+    if col_type == "bool":
+        return isinstance(value, bool)
+    if col_type == "int":
+        return (
+            isinstance(value, int)
+            and not isinstance(value, bool)
+            and -(2 ** 63) <= value < 2 ** 63
+        )
+    if col_type == "float":
+        return isinstance(value, float)
+    return isinstance(value, str)
+
+
+def _encode_column(
+    values: List[Any],
+    col_type: str,
+) -> Tuple[List[array], bytes, Dict[str, Any]]:
+    overrides = {}
+    for position, value in enumerate(values):
+        if not _matches_type(value, col_type):
+            overrides[str(position)] = value
+
+    if col_type in _TYPECODES:
+        default = False if col_type == "bool" else 0
+        column = array(
+            _TYPECODES[col_type],
+            (default if str(p) in overrides else v for p, v in enumerate(values))
+            if overrides else values,
+        )
+        return [column], b"", overrides
+
+    dictionary: Dict[str, int] = {}
+    codes = array(_STR_CODE)
+    for position, value in enumerate(values):
+        if str(position) in overrides:
+            codes.append(0)
+            continue
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        codes.append(code)
+
+    dictionary_bytes = json.dumps(list(dictionary), ensure_ascii=False).encode()
+    prefix = struct.pack("<I", len(dictionary_bytes)) + dictionary_bytes
+    return [codes], prefix, overrides
+
+
+def write_table(
+    path: Path,
+    data: List[Dict[str, Any]],
+    column_types: List[Tuple[str, str]],
+) -> None:
+    known = {name for name, _ in column_types}
+    column_types = list(column_types)
+    for record in data:
+        for name in record:
+            if name not in known:
+                known.add(name)
+                column_types.append((name, "str"))
+
+    blocks = []
+    header_columns = []
+    offset = 0
+    for name, col_type in column_types:
+        col_type = col_type if col_type in _TYPECODES else "str"
+        values = [record.get(name) for record in data]
+        arrays, prefix, overrides = _encode_column(values, col_type)
+        length = len(prefix) + sum(len(a) * a.itemsize for a in arrays)
+        header_columns.append({
+            "name": name,
+            "type": col_type,
+            "offset": offset,
+            "length": length,
+            "overrides": overrides,
+        })
+        blocks.append((prefix, arrays))
+        offset += length
+
+    header = json.dumps({
+        "rows": len(data),
+        "byteorder": sys.byteorder,
+        "columns": header_columns,
+    }, ensure_ascii=False).encode()
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for prefix, arrays in blocks:
+            f.write(prefix)
+            for column in arrays:
+                column.tofile(f)
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        return _read_header(f)
+
+
+def _read_header(f) -> Dict[str, Any]:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"Файл '{f.name}' не является столбцовой таблицей")
+
+    (header_length,) = struct.unpack("<I", f.read(4))
+    header = json.loads(f.read(header_length).decode())
+    header["data_offset"] = len(MAGIC) + 4 + header_length
+    return header
+
+
+def _read_column(f, header: Dict[str, Any], column: Dict[str, Any]) -> List[Any]:
+    f.seek(header["data_offset"] + column["offset"])
+    rows = header["rows"]
+    col_type = column["type"]
+
+    if col_type in _TYPECODES:
+        values = array(_TYPECODES[col_type])
+        values.frombytes(f.read(rows * values.itemsize))
+        if header["byteorder"] != sys.byteorder:
+            values.byteswap()
+        result = values.tolist()
+        if col_type == "bool":
+            result = [bool(value) for value in result]
+    else:
+        (dictionary_length,) = struct.unpack("<I", f.read(4))
+        dictionary = json.loads(f.read(dictionary_length).decode())
+        codes = array(_STR_CODE)
+        codes.frombytes(f.read(rows * codes.itemsize))
+        if header["byteorder"] != sys.byteorder:
+            codes.byteswap()
+        result = [dictionary[code] for code in codes]
+
+    for position, value in column["overrides"].items():
+        result[int(position)] = value
+    return result
+
+
+def read_columns(
+    path: Path,
+    columns: Optional[Iterable[str]] = None,
+) -> Tuple[int, Dict[str, List[Any]]]:
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+        by_name = {column["name"]: column for column in header["columns"]}
+        wanted = list(by_name) if columns is None else columns
+
+        result = {}
+        for name in wanted:
+            if name in by_name:
+                result[name] = _read_column(f, header, by_name[name])
+        return header["rows"], result
+
+
+def read_rows(
+    path: Path,
+    positions: Optional[List[int]] = None,
+) -> List[Dict[str, Any]]:
+    rows, columns = read_columns(path)
+    if positions is None:
+        positions = range(rows)
+
+    names = list(columns)
+    return [
+        {name: columns[name][position] for name in names}
+        for position in positions
+    ]
+
+
+def column_bytes(path: Path, columns: Iterable[str]) -> int:
+    wanted = set(columns)
+    header = read_header(path)
+    return sum(
+        column["length"] for column in header["columns"]
+        if column["name"] in wanted
+    )
+
+
+def column_types(path: Path) -> List[Tuple[str, str]]:
+    header = read_header(path)
+    return [(column["name"], column["type"]) for column in header["columns"]]
@@ -1,50 +1,199 @@
+import csv
 import json
 import os
-from typing import Any, Dict, List, Optional
-
-
-def handle_db_errors(func):
-    def wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            print(f"Ошибка в функции {func.__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-    return wrapper
-
-
-def confirm_action(action_name):
-    def decorator(func):
-        return func
-    return decorator
-
-
-def log_time(func):
-    return func
-
-
-def create_cacher():
-    def cache_result(key, value_func):
-        return value_func()
-    return cache_result
-
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 try:
+    from . import metrics
+    from .aggregates import (
+        aggregate_label,
+        finish_states,
+        fold_aggregates,
+        initial_states,
+        validate_aggregates,
+    )
+    from .decorators import (
+        approximate_size,
+        confirm_action,
+        create_cacher,
+        handle_db_errors,
+        log_time,
+    )
+    from .indexes import (
+        build_index,
+        drop_table_indexes,
+        flush_table_indexes,
+        forget_table_indexes,
+        index_delete,
+        index_insert,
+        index_update,
+        load_index,
+        lookup_index,
+        ordered_positions,
+        range_index,
+    )
+    from .joins import hash_join, joined_schema, merge_join, split_join_where
+    from .parallel import parallel_scan, parallel_scan_enabled
+    from .planner import (
+        Stage,
+        estimate_lookup,
+        estimate_range,
+        format_where,
+        lazy_stage,
+        stage_timer,
+        where_terms,
+    )
+    from .predicates import (
+        compile_predicate,
+        equality_values,
+        evaluate_columns,
+        index_lookups,
+        normalize_where,
+        range_bounds,
+        where_columns,
+    )
+    from .rowstore import MappedRows
+    from .schema import get_schema, invalidate_schema, parse_column_def
+    from .stats import (
+        drop_table_stats,
+        fresh_table_stats,
+        load_table_stats,
+        matching_ranges,
+        stats_delete,
+        stats_insert,
+        stats_row_count,
+        stats_update,
+        summarize_stats,
+    )
     from .utils import (
-        convert_to_type,
+        abort_transaction,
+        append_table_records,
+        count_table_rows,
+        drop_next_id,
+        finish_transaction,
+        get_table_files_stamp,
+        in_transaction,
+        is_columnar_table,
+        is_mapped_table,
+        load_next_id,
+        load_table_columns,
         load_table_data,
+        load_table_rows,
+        log_change,
+        open_table_view,
+        peek_table_cache,
+        save_next_id,
         save_table_data,
+        set_table_storage,
+        start_transaction,
+        table_column_bytes,
+        transaction_conflicts,
     )
 except ImportError:
+    import metrics
+    from aggregates import (
+        aggregate_label,
+        finish_states,
+        fold_aggregates,
+        initial_states,
+        validate_aggregates,
+    )
+    from decorators import (
+        approximate_size,
+        confirm_action,
+        create_cacher,
+        handle_db_errors,
+        log_time,
+    )
+    from indexes import (
+        build_index,
+        drop_table_indexes,
+        flush_table_indexes,
+        forget_table_indexes,
+        index_delete,
+        index_insert,
+        index_update,
+        load_index,
+        lookup_index,
+        ordered_positions,
+        range_index,
+    )
+    from joins import hash_join, joined_schema, merge_join, split_join_where
+    from parallel import parallel_scan, parallel_scan_enabled
+    from planner import (
+        Stage,
+        estimate_lookup,
+        estimate_range,
+        format_where,
+        lazy_stage,
+        stage_timer,
+        where_terms,
+    )
+    from predicates import (
+        compile_predicate,
+        equality_values,
+        evaluate_columns,
+        index_lookups,
+        normalize_where,
+        range_bounds,
+        where_columns,
+    )
+    from rowstore import MappedRows
+    from schema import get_schema, invalidate_schema, parse_column_def
+    from stats import (
+        drop_table_stats,
+        fresh_table_stats,
+        load_table_stats,
+        matching_ranges,
+        stats_delete,
+        stats_insert,
+        stats_row_count,
+        stats_update,
+        summarize_stats,
+    )
     from utils import (
-        convert_to_type,
+        abort_transaction,
+        append_table_records,
+        count_table_rows,
+        drop_next_id,
+        finish_transaction,
+        get_table_files_stamp,
+        in_transaction,
+        is_columnar_table,
+        is_mapped_table,
+        load_next_id,
+        load_table_columns,
         load_table_data,
+        load_table_rows,
+        log_change,
+        open_table_view,
+        peek_table_cache,
+        save_next_id,
         save_table_data,
+        set_table_storage,
+        start_transaction,
+        table_column_bytes,
+        transaction_conflicts,
     )
 
-cache_result = create_cacher()
+RESULT_CACHE_ENTRIES = 256
+RESULT_CACHE_BYTES = 32 * 1024 * 1024
+
+result_cache = create_cacher(RESULT_CACHE_ENTRIES, RESULT_CACHE_BYTES)
+_table_versions: Dict[str, int] = {}
+_next_ids: Dict[str, Tuple[Tuple[Optional[Tuple[int, int]], ...], int]] = {}
+
+
+def _result_cache_metrics() -> Dict[str, float]:
+    return {
+        f"result_cache_{name}": value
+        for name, value in result_cache.stats().items()
+    }
+
+
+metrics.register_collector(_result_cache_metrics)
 
 
 def create_database(db_name: str) -> Dict[str, Any]:
@@ -94,6 +243,7 @@ def db_drop_table(db: Dict[str, Any], table_name: str) -> Dict[str, Any]:
         raise KeyError(f"Таблица {table_name} не найдена")
 
     del db['tables'][table_name]
+    result_cache.invalidate(table_name)
     print(f"Таблица '{table_name}' удалена")
     return db
 
@@ -106,7 +256,7 @@ def db_select(
     condition=None,
     columns=None
 ) -> List[Dict[str, Any]]:
-    cache_key = f"select_{table_name}_{str(condition)}_{str(columns)}"
+    cache_key = f"select_{db['db_name']}_{table_name}_{condition}_{columns}"
 
     def execute_select():
         table = get_table(db, table_name)
@@ -124,7 +274,7 @@ def db_select(
 
         return result
 
-    return cache_result(cache_key, execute_select)
+    return result_cache(cache_key, execute_select, tag=table_name)
 
 
 @log_time
@@ -141,6 +291,7 @@ def db_insert(db: Dict[str, Any], table_name: str, data: Dict[str, Any]) -> int:
     table['next_id'] += 1
 
     table['data'].append(data_with_id)
+    result_cache.invalidate(table_name)
     print(f"Добавлена запись в таблицу '{table_name}' (ID: {data_with_id['id']})")
     return data_with_id['id']
 
@@ -156,6 +307,7 @@ def db_delete(
     initial_count = len(table['data'])
 
     table['data'] = [row for row in table['data'] if not condition(row)]
+    result_cache.invalidate(table_name)
 
     deleted_count = initial_count - len(table['data'])
     print(f"Удалено {deleted_count} записей из таблицы '{table_name}'")
@@ -177,6 +329,9 @@ def db_update(
             row.update(updates)
             updated_count += 1
 
+    if updated_count:
+        result_cache.invalidate(table_name)
+
     print(f"Обновлено {updated_count} записей в таблице '{table_name}'")
     return updated_count
 
@@ -222,7 +377,15 @@ def create_table(
     if table_name in metadata:
         raise ValueError(f"Таблица '{table_name}' уже существует")
 
-    metadata[table_name] = {"columns": columns}
+    if "ID" not in [parse_column_def(col_def)[0] for col_def in columns]:
+        columns = ["ID int"] + columns
+
+    metadata[table_name] = {
+        "columns": columns,
+        "primary_key": "ID",
+        "next_id": 1,
+    }
+    log_change({"op": "create", "table": table_name, "key": "ID"})
     return metadata
 
 
@@ -232,10 +395,401 @@ def drop_table(metadata: Dict[str, Any], table_name: str) -> Dict[str, Any]:
     if table_name not in metadata:
         raise KeyError(f"Таблица '{table_name}' не найдена")
 
+    drop_table_indexes(table_name, _table_indexes(table_name, metadata))
+    drop_table_stats(table_name)
+    _bump_table_version(table_name)
+    invalidate_schema(table_name)
+    _next_ids.pop(table_name, None)
+    drop_next_id(table_name)
     del metadata[table_name]
     return metadata
 
 
+@handle_db_errors
+def create_index(
+    metadata: Dict[str, Any],
+    table_name: str,
+    column: str,
+    kind: str = "hash",
+) -> Dict[str, Any]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
+
+    table_info = metadata[table_name]
+    schema = get_schema(table_name, table_info)
+
+    if column not in schema["positions"]:
+        raise KeyError(f"Столбец '{column}' не найден в таблице '{table_name}'")
+
+    if kind not in ("hash", "sorted"):
+        raise ValueError(f"Неизвестный тип индекса: {kind}")
+
+    indexes = _table_indexes(table_name, metadata)
+    current = indexes.get(column)
+    if current == kind:
+        raise ValueError(f"Индекс по столбцу '{column}' уже существует")
+
+    column_values = load_table_columns(table_name, [column])
+    if column_values is not None:
+        rows = [{column: value} for value in column_values[column]]
+    else:
+        rows = load_table_data(table_name)
+
+    if current is not None:
+        drop_table_indexes(table_name, {column: current})
+        current_key = "indexes" if current == "hash" else "sorted_indexes"
+        if column in table_info.get(current_key, []):
+            table_info[current_key].remove(column)
+
+    build_index(table_name, column, rows, kind)
+    key = "indexes" if kind == "hash" else "sorted_indexes"
+    table_info.setdefault(key, []).append(column)
+    return metadata
+
+
+@handle_db_errors
+def set_storage(
+    metadata: Dict[str, Any],
+    table_name: str,
+    storage: str,
+) -> Dict[str, Any]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
+
+    if in_transaction():
+        raise ValueError("Нельзя менять формат хранения внутри транзакции")
+
+    if storage not in ("json", "columnar", "rows"):
+        raise ValueError(
+            f"Неизвестный формат хранения '{storage}'. "
+            "Доступны: json, columnar, rows"
+        )
+
+    table_info = metadata[table_name]
+    schema = get_schema(table_name, table_info)
+    set_table_storage(table_name, storage, schema["columns"])
+    _bump_table_version(table_name)
+    table_info["storage"] = storage
+    return metadata
+
+
+def _table_indexes(table_name: str, metadata: Dict[str, Any]) -> Dict[str, str]:
+    table_info = metadata[table_name]
+    indexed = {}
+    primary_key = get_schema(table_name, table_info)["primary_key"]
+    if primary_key:
+        indexed[primary_key] = "hash"
+    for column in table_info.get("indexes", []):
+        indexed[column] = "hash"
+    for column in table_info.get("sorted_indexes", []):
+        indexed[column] = "sorted"
+    return indexed
+
+
+def _bump_table_version(table_name: str) -> None:
+    _table_versions[table_name] = _table_versions.get(table_name, 0) + 1
+    result_cache.invalidate(table_name)
+
+
+def _result_key(table_name: str, *query: Any) -> Tuple[Any, ...]:
+    return (
+        table_name,
+        _table_versions.get(table_name, 0),
+        get_table_files_stamp(table_name),
+        repr(query),
+    )
+
+
+def _cache_rows(
+    key: Tuple[Any, ...],
+    table_name: str,
+    rows: Iterator[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    collected: Optional[List[Dict[str, Any]]] = []
+    size = 0
+    returned = 0
+    for row in rows:
+        returned += 1
+        if collected is not None:
+            size += approximate_size(row)
+            if size > result_cache.max_entry_bytes:
+                collected = None
+            else:
+                collected.append(row)
+        yield row
+
+    metrics.increment("rows_returned_total", returned, table=table_name)
+    if collected is not None:
+        result_cache.put(key, collected, size, tag=table_name)
+
+
+def cache_stats() -> Dict[str, int]:
+    return result_cache.stats()
+
+
+def clear_cache() -> int:
+    return result_cache.invalidate()
+
+
+def _table_stats(
+    metadata: Dict[str, Any],
+    table_name: str,
+    load_rows: Optional[Callable[[], Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    schema = get_schema(table_name, metadata[table_name])
+    return load_table_stats(
+        table_name,
+        schema["names"],
+        load_rows or (lambda: load_table_data(table_name)),
+    )
+
+
+def _count_rows(table_name: str, cache: bool = True) -> int:
+    rows = stats_row_count(table_name)
+    return count_table_rows(table_name, cache) if rows is None else rows
+
+
+def _zone_ranges(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    load_rows: Optional[Callable[[], Any]] = None,
+) -> Optional[List[Tuple[int, int]]]:
+    if where is None:
+        return None
+    stats = _table_stats(metadata, table_name, load_rows)
+    if stats is None:
+        return None
+    schema = get_schema(table_name, metadata[table_name])
+    return matching_ranges(stats, where, schema)
+
+
+def _range_positions(
+    data: List[Dict[str, Any]],
+    ranges: List[Tuple[int, int]],
+    values: List[Any],
+) -> Iterator[int]:
+    for start, stop in ranges:
+        if isinstance(data, MappedRows):
+            yield from data.prefilter(values, start, stop)
+        else:
+            yield from range(start, stop)
+
+
+def _column_positions(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Tuple,
+    columns: Dict[str, List[Any]],
+) -> Iterator[int]:
+    schema = get_schema(table_name, metadata[table_name])
+    ranges = _zone_ranges(metadata, table_name, where)
+    if ranges is None:
+        ranges = [(0, len(next(iter(columns.values()))))]
+
+    metrics.increment(
+        "rows_scanned_total",
+        sum(stop - start for start, stop in ranges),
+        table=table_name,
+    )
+    for start, stop in ranges:
+        mask = evaluate_columns(where, schema, {
+            name: values[start:stop] for name, values in columns.items()
+        })
+        for offset, bit in enumerate(mask):
+            if bit:
+                yield start + offset
+
+
+def _order_key(value: Any) -> Tuple[int, Any]:
+    if isinstance(value, (bool, int, float)):
+        return 0, value
+    if isinstance(value, str):
+        return 1, value
+    return 2, 0
+
+
+def _sort_positions(
+    data: List[Dict[str, Any]],
+    positions: List[int],
+    column: str,
+    descending: bool,
+) -> List[int]:
+    keyed = [(_order_key(data[p].get(column)), p) for p in positions]
+    present = [item for item in keyed if item[0][0] < 2]
+    missing = [p for key, p in keyed if key[0] == 2]
+    present.sort(key=lambda item: item[0], reverse=descending)
+    return [p for _, p in present] + missing
+
+
+def _next_id(
+    table_name: str,
+    table_info: Dict[str, Any],
+    data: List[Dict[str, Any]],
+    primary_key: Optional[str],
+) -> int:
+    known = _next_ids.get(table_name)
+    if known is not None and known[0] == get_table_files_stamp(table_name):
+        return known[1]
+
+    ids = [
+        record.get(primary_key) for record in data
+        if isinstance(record.get(primary_key), int)
+    ]
+    return max(
+        max(ids, default=len(data)) + 1,
+        table_info.get("next_id", 1),
+        load_next_id(table_name),
+        known[1] if known is not None else 1,
+    )
+
+
+def _log_table_change(
+    table_name: str,
+    primary_key: Optional[str],
+    change: Dict[str, Any],
+    data: List[Dict[str, Any]],
+    positions: Optional[List[int]] = None,
+) -> None:
+    if primary_key is None:
+        if positions is None:
+            change = {"op": "replace", "records": data}
+        else:
+            change = {**change, "positions": positions}
+    log_change({"table": table_name, "key": primary_key, **change})
+
+
+def _iter_positions(
+    metadata: Dict[str, Any],
+    table_name: str,
+    data: List[Dict[str, Any]],
+    where: Optional[Tuple],
+    predicate: Callable[[Dict[str, Any]], bool],
+    order_by: Optional[Tuple[str, bool]] = None,
+) -> Iterator[int]:
+    schema = get_schema(table_name, metadata[table_name])
+    indexed = _table_indexes(table_name, metadata)
+    sorted_columns = [c for c, kind in indexed.items() if kind == "sorted"]
+
+    if order_by is not None and indexed.get(order_by[0]) == "sorted":
+        column, descending = order_by
+        bounds = range_bounds(where, [column], schema)
+        candidates = None
+        if bounds is not None:
+            candidates = range_index(table_name, column, data, *bounds[1:])
+            if candidates is not None and descending:
+                candidates = candidates[::-1]
+        if candidates is None:
+            candidates = ordered_positions(table_name, column, data, descending)
+        metrics.increment("rows_scanned_total", len(candidates), table=table_name)
+        return (
+            position for position in candidates
+            if predicate(data[position])
+        )
+
+    candidates = None
+    lookups = index_lookups(where, indexed, schema)
+    if lookups is not None:
+        positions = set()
+        for column, value in lookups:
+            positions.update(
+                lookup_index(table_name, column, value, data, indexed[column])
+            )
+        candidates = sorted(positions)
+    else:
+        bounds = range_bounds(where, sorted_columns, schema)
+        if bounds is not None:
+            candidates = range_index(table_name, bounds[0], data, *bounds[1:])
+            if candidates is not None:
+                candidates = sorted(candidates)
+
+    matched = None
+    scanned = len(data) if candidates is None else len(candidates)
+    if candidates is None and where is not None:
+        ranges = _zone_ranges(metadata, table_name, where, lambda: data)
+        if ranges is not None:
+            values = equality_values(where, schema)
+            candidates = _range_positions(data, ranges, values)
+            scanned = sum(stop - start for start, stop in ranges)
+        else:
+            matched = parallel_scan(
+                table_name, metadata[table_name], data, where
+            )
+    metrics.increment("rows_scanned_total", scanned, table=table_name)
+
+    if matched is None:
+        if candidates is None:
+            if where is not None and isinstance(data, MappedRows):
+                candidates = data.prefilter(equality_values(where, schema))
+            else:
+                candidates = range(len(data))
+        matched = (
+            position for position in candidates
+            if where is None or predicate(data[position])
+        )
+    if order_by is None:
+        return matched
+    return iter(_sort_positions(data, list(matched), *order_by))
+
+
+def _can_scan_columns(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+) -> bool:
+    if where is None or not is_columnar_table(table_name):
+        return False
+    if peek_table_cache(table_name) is not None:
+        return False
+
+    schema = get_schema(table_name, metadata[table_name])
+    indexed = _table_indexes(table_name, metadata)
+    sorted_columns = [c for c, kind in indexed.items() if kind == "sorted"]
+    return (
+        index_lookups(where, indexed, schema) is None
+        and range_bounds(where, sorted_columns, schema) is None
+    )
+
+
+@handle_db_errors
+def begin(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    start_transaction(metadata)
+    return metadata
+
+
+@handle_db_errors
+def commit(metadata: Dict[str, Any]) -> List[str]:
+    conflicts = transaction_conflicts()
+    if conflicts:
+        _discard_transaction(metadata)
+        raise ValueError(
+            "Транзакция отменена: другой процесс изменил "
+            + ", ".join(conflicts)
+        )
+
+    tables = finish_transaction()
+    for table_name in tables:
+        flush_table_indexes(table_name)
+        _bump_table_version(table_name)
+    return tables
+
+
+@handle_db_errors
+def rollback(metadata: Dict[str, Any]) -> List[str]:
+    return _discard_transaction(metadata)
+
+
+def _discard_transaction(metadata: Dict[str, Any]) -> List[str]:
+    tables, original_metadata = abort_transaction()
+    for table_name in tables:
+        forget_table_indexes(table_name)
+        _bump_table_version(table_name)
+
+    metadata.clear()
+    metadata.update(original_metadata)
+    return tables
+
+
 @handle_db_errors
 def list_tables(metadata: Dict[str, Any]) -> List[str]:
     return list(metadata.keys())
@@ -249,103 +803,570 @@ def describe_table(
     return metadata.get(table_name)
 
 
+def _insert_rows(
+    metadata: Dict[str, Any],
+    table_name: str,
+    rows: List[List[str]],
+) -> List[Any]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
+
+    table_info = metadata[table_name]
+    schema = get_schema(table_name, table_info)
+    primary_key = schema["primary_key"]
+    columns = schema["insert_columns"]
+    auto_columns = schema["auto_insert_columns"]
+
+    data = load_table_data(table_name)
+    indexed = _table_indexes(table_name, metadata)
+    next_id = _next_id(table_name, table_info, data, primary_key)
+    _table_stats(metadata, table_name, lambda: data)
+    new_records = []
+    new_ids = []
+    batch_ids = set()
+
+    for values in rows:
+        auto_id = primary_key is not None and len(values) == len(auto_columns)
+        row_columns = auto_columns if auto_id else columns
+
+        if len(values) != len(row_columns):
+            raise ValueError(
+                f"Неверное количество значений. Ожидается {len(row_columns)}, "
+                f"получено {len(values)}"
+            )
+
+        new_record = {}
+        if auto_id:
+            new_record[primary_key] = next_id
+
+        for (col_name, col_type, converter), value in zip(
+            row_columns, values, strict=True
+        ):
+            try:
+                new_record[col_name] = converter(value)
+            except Exception as e:
+                raise ValueError(
+                    f"Ошибка в столбце '{col_name} {col_type}': {e}"
+                ) from e
+
+        new_id = new_record.get(primary_key) if primary_key else next_id
+        if primary_key is not None and not auto_id:
+            if new_id in batch_ids or lookup_index(
+                table_name, primary_key, new_id, data, indexed[primary_key]
+            ):
+                raise ValueError(
+                    f"Запись с {primary_key}={new_id} уже существует "
+                    f"в таблице '{table_name}'"
+                )
+
+        batch_ids.add(new_id)
+        if isinstance(new_id, int) and new_id >= next_id:
+            next_id = new_id + 1
+
+        new_records.append(new_record)
+        new_ids.append(new_id)
+
+    position = len(data)
+    _log_table_change(
+        table_name,
+        primary_key,
+        {"op": "insert", "records": new_records, "next_id": next_id},
+        data,
+        list(range(position, position + len(new_records))),
+    )
+    save_next_id(table_name, next_id)
+    append_table_records(table_name, new_records)
+    stats_insert(table_name, new_records, position)
+    _bump_table_version(table_name)
+    for offset, record in enumerate(new_records):
+        index_insert(table_name, indexed, record, position + offset)
+
+    table_info["next_id"] = next_id
+    _next_ids[table_name] = (get_table_files_stamp(table_name), next_id)
+    return new_ids
+
+
 @log_time
 @handle_db_errors
 def insert(
     metadata: Dict[str, Any],
     table_name: str,
     values: List[str],
+) -> Dict[str, Any]:
+    new_ids = _insert_rows(metadata, table_name, [values])
+    return {"id": new_ids[0]}
+
+
+@log_time
+@handle_db_errors
+def insert_many(
+    metadata: Dict[str, Any],
+    table_name: str,
+    rows: List[List[str]],
+) -> Dict[str, Any]:
+    new_ids = _insert_rows(metadata, table_name, rows)
+    return {"ids": new_ids, "count": len(new_ids)}
+
+
+@log_time
+@handle_db_errors
+def import_csv(
+    metadata: Dict[str, Any],
+    table_name: str,
+    file_path: str,
 ) -> Dict[str, Any]:
     if table_name not in metadata:
         raise KeyError(f"Таблица '{table_name}' не найдена")
 
-    table_info = metadata[table_name]
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Файл {file_path} не найден")
+
+    schema = get_schema(table_name, metadata[table_name])
+    columns = schema["insert_columns"]
+    auto_columns = schema["auto_insert_columns"]
+
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        rows = [row for row in reader if row]
+
+    if rows:
+        header = [name.strip() for name in rows[0]]
+        for candidate in (columns, auto_columns):
+            names = [col_name for col_name, _, _ in candidate]
+            if sorted(header) == sorted(names):
+                order = [header.index(name) for name in names]
+                rows = [
+                    [row[i] for i in order] if len(row) == len(header) else row
+                    for row in rows[1:]
+                ]
+                break
 
-    if not isinstance(table_info, dict):
-        raise ValueError(f"Метаданные таблицы '{table_name}' повреждены")
+    new_ids = _insert_rows(metadata, table_name, rows)
+    return {"ids": new_ids, "count": len(new_ids)}
 
-    if "columns" not in table_info:
-        raise ValueError(
-            f"Таблица '{table_name}' не содержит определения столбцов"
-        )
 
-    columns_list = table_info["columns"]
-    if not isinstance(columns_list, list):
-        raise ValueError(
-            f"Определение столбцов в таблице '{table_name}' "
-            "должно быть списком"
-        )
+@log_time
+@handle_db_errors
+def select(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where_clause: Optional[Any] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    order_by: Optional[Tuple[str, bool]] = None,
+) -> Iterator[Dict[str, Any]]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
 
-    expected_count = len(columns_list)
+    _check_window(limit, offset)
 
-    if len(values) != expected_count:
-        raise ValueError(
-            f"Неверное количество значений. Ожидается {expected_count}, "
-            f"получено {len(values)}"
-        )
+    where = normalize_where(where_clause)
+    key = _result_key(table_name, "select", where, order_by, limit, offset)
+    cached = result_cache.get(key)
+    if cached is not None:
+        metrics.increment("rows_returned_total", len(cached), table=table_name)
+        return iter(cached)
 
-    data = load_table_data(table_name)
-    new_record = {}
-    new_id = len(data) + 1
+    schema = get_schema(table_name, metadata[table_name])
+    predicate = compile_predicate(where, schema)
+    return _cache_rows(key, table_name, _iter_select(
+        metadata, table_name, where, predicate, limit, offset, order_by
+    ))
 
-    for i, col_def in enumerate(columns_list):
-        try:
-            if not isinstance(col_def, str):
-                raise ValueError(
-                    f"Определение столбца должно быть строкой, "
-                    f"получено: {type(col_def)}"
-                )
 
-            parts = col_def.split(" ")
-            if len(parts) == 1:
-                col_name = parts[0]
-                col_type = "str"
-            else:
-                col_name = " ".join(parts[:-1])
-                col_type = parts[-1]
+def _check_window(limit: Optional[int], offset: int) -> None:
+    if limit is not None and limit < 0:
+        raise ValueError("LIMIT не может быть отрицательным")
+    if offset < 0:
+        raise ValueError("OFFSET не может быть отрицательным")
 
-            converted_value = convert_to_type(values[i], col_type)
-            new_record[col_name] = converted_value
-        except Exception as e:
-            raise ValueError(f"Ошибка в столбце '{col_def}': {e}") from e
 
-    data.append(new_record)
-    save_table_data(table_name, data)
+def _iter_select(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    predicate: Callable[[Dict[str, Any]], bool],
+    limit: Optional[int],
+    offset: int,
+    order_by: Optional[Tuple[str, bool]],
+    stage: Stage = lazy_stage,
+) -> Iterator[Dict[str, Any]]:
+    stop = None if limit is None else offset + limit
+
+    if order_by is None and _can_scan_columns(metadata, table_name, where):
+        columns = stage(
+            "чтение столбцов",
+            lambda: load_table_columns(table_name, where_columns(where)),
+        )
+        positions = stage(
+            "фильтр по столбцам",
+            lambda: list(_column_positions(metadata, table_name, where, columns)),
+        )
+        yield from stage(
+            "чтение строк",
+            lambda: load_table_rows(table_name, positions[offset:stop]),
+        )
+    elif is_mapped_table(table_name) and peek_table_cache(table_name) is None:
+        view = stage("открытие файла", lambda: open_table_view(table_name))
+        try:
+            positions = stage("поиск строк", lambda: islice(
+                _iter_positions(
+                    metadata, table_name, view, where, predicate, order_by
+                ),
+                offset,
+                stop,
+            ))
+            yield from stage(
+                "чтение строк", lambda: (view[position] for position in positions)
+            )
+        finally:
+            _close_view(table_name, view)
+    else:
+        data = stage("загрузка таблицы", lambda: load_table_data(table_name))
+        positions = stage("поиск строк", lambda: islice(
+            _iter_positions(metadata, table_name, data, where, predicate, order_by),
+            offset,
+            stop,
+        ))
+        yield from stage(
+            "чтение строк", lambda: (data[position] for position in positions)
+        )
+
 
-    return {"id": new_id}
+def _close_view(table_name: str, view: MappedRows) -> None:
+    metrics.increment("table_bytes_read_total", view.bytes_read, table=table_name)
+    view.close()
 
 
-@log_time
 @handle_db_errors
-def select(
+def aggregate(
     metadata: Dict[str, Any],
     table_name: str,
-    where_clause: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
+    aggregates: List[Tuple[str, Optional[str]]],
+    where_clause: Optional[Any] = None,
+    group_by: Optional[str] = None,
+) -> List[Dict[str, Any]]:
     if table_name not in metadata:
         raise KeyError(f"Таблица '{table_name}' не найдена")
 
-    data = load_table_data(table_name)
+    schema = get_schema(table_name, metadata[table_name])
+    validate_aggregates(aggregates, schema, group_by)
+    where = normalize_where(where_clause)
+    key = _result_key(table_name, "aggregate", aggregates, where, group_by)
+    return result_cache(
+        key,
+        lambda: _compute_aggregate(
+            metadata, table_name, aggregates, where, group_by
+        ),
+        tag=table_name,
+    )
+
+
+def _compute_aggregate(
+    metadata: Dict[str, Any],
+    table_name: str,
+    aggregates: List[Tuple[str, Optional[str]]],
+    where: Optional[Tuple],
+    group_by: Optional[str],
+    stage: Stage = lazy_stage,
+) -> List[Dict[str, Any]]:
+    schema = get_schema(table_name, metadata[table_name])
+    predicate = compile_predicate(where, schema)
+
+    funcs = [func for func, _ in aggregates]
+    labels = [aggregate_label(func, column) for func, column in aggregates]
+    columns = [column for _, column in aggregates]
+    if group_by is not None:
+        columns.insert(0, group_by)
+
+    if where is None and group_by is None and all(c is None for c in columns):
+        rows = stage("подсчёт строк", lambda: _count_rows(table_name))
+        return [dict.fromkeys(labels, rows)]
+
+    groups = stage("агрегирование", lambda: fold_aggregates(
+        funcs,
+        _aggregate_rows(metadata, table_name, where, predicate, columns, stage),
+        group_by is not None,
+    ))
+    if group_by is None:
+        states = groups.get(None, initial_states(funcs))
+        return [dict(zip(labels, finish_states(funcs, states), strict=True))]
+
     result = []
-    matched_ids = []
+    for key in sorted(groups, key=_order_key):
+        values = finish_states(funcs, groups[key])
+        result.append({group_by: key, **dict(zip(labels, values, strict=True))})
+    return result
+
+
+def _aggregate_rows(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    predicate: Callable[[Dict[str, Any]], bool],
+    columns: List[Optional[str]],
+    stage: Stage = lazy_stage,
+) -> Iterator[Tuple[Any, ...]]:
+    if _can_aggregate_columns(metadata, table_name, where):
+        loaded = stage("чтение столбцов", lambda: load_table_columns(
+            table_name, _aggregate_columns(metadata, table_name, where, columns)
+        ))
+        positions = range(len(next(iter(loaded.values()))))
+        if where is None:
+            metrics.increment(
+                "rows_scanned_total", len(positions), table=table_name
+            )
+        else:
+            positions = stage(
+                "фильтр по столбцам",
+                lambda: _column_positions(metadata, table_name, where, loaded),
+            )
+        yield from stage("чтение значений", lambda: (
+            tuple(
+                loaded[column][position] if column else True
+                for column in columns
+            )
+            for position in positions
+        ))
+    elif is_mapped_table(table_name) and peek_table_cache(table_name) is None:
+        view = stage("открытие файла", lambda: open_table_view(table_name))
+        try:
+            positions = stage("поиск строк", lambda: _iter_positions(
+                metadata, table_name, view, where, predicate
+            ))
+            yield from stage(
+                "чтение значений", lambda: _row_values(view, positions, columns)
+            )
+        finally:
+            _close_view(table_name, view)
+    else:
+        data = stage("загрузка таблицы", lambda: load_table_data(table_name))
+        positions = stage("поиск строк", lambda: _iter_positions(
+            metadata, table_name, data, where, predicate
+        ))
+        yield from stage(
+            "чтение значений", lambda: _row_values(data, positions, columns)
+        )
+
+
+def _can_aggregate_columns(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+) -> bool:
+    return is_columnar_table(table_name) and (
+        _can_scan_columns(metadata, table_name, where)
+        or (where is None and peek_table_cache(table_name) is None)
+    )
+
+
+def _aggregate_columns(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    columns: List[Optional[str]],
+) -> Set[str]:
+    needed = {column for column in columns if column} | where_columns(where)
+    if not needed:
+        needed = {get_schema(table_name, metadata[table_name])["names"][0]}
+    return needed
+
+
+def _row_values(
+    data: List[Dict[str, Any]],
+    positions: Iterable[int],
+    columns: List[Optional[str]],
+) -> Iterator[Tuple[Any, ...]]:
+    for position in positions:
+        record = data[position]
+        yield tuple(record.get(column) if column else True for column in columns)
+
+
+@log_time
+@handle_db_errors
+def join(
+    metadata: Dict[str, Any],
+    left_table: str,
+    right_table: str,
+    on: Tuple[str, str],
+    where_clause: Optional[Any] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    pushed, residual = _prepare_join(
+        metadata, (left_table, right_table), on, where_clause, limit, offset
+    )
+    schemas = _join_schemas(metadata, (left_table, right_table))
+    predicate = compile_predicate(residual, joined_schema(schemas))
+    return _iter_join(
+        metadata, (left_table, right_table), on, pushed, predicate, limit, offset
+    )
+
 
-    for record in data:
-        match = True
-        if where_clause:
-            for column, value in where_clause.items():
-                try:
-                    if str(record.get(column, "")) != str(value):
-                        match = False
-                        break
-                except Exception:
-                    match = False
-                    break
+def _prepare_join(
+    metadata: Dict[str, Any],
+    tables: Tuple[str, str],
+    on: Tuple[str, str],
+    where_clause: Optional[Any],
+    limit: Optional[int],
+    offset: int,
+) -> Tuple[Dict[str, Optional[Tuple]], Optional[Tuple]]:
+    for table_name in tables:
+        if table_name not in metadata:
+            raise KeyError(f"Таблица '{table_name}' не найдена")
+
+    if tables[0] == tables[1]:
+        raise ValueError("Соединение таблицы с самой собой не поддерживается")
+    _check_window(limit, offset)
+
+    schemas = _join_schemas(metadata, tables)
+    for table_name, column in zip(tables, on, strict=True):
+        if column not in schemas[table_name]["positions"]:
+            raise KeyError(
+                f"Столбец '{column}' не найден в таблице '{table_name}'"
+            )
+
+    return split_join_where(normalize_where(where_clause), schemas)
+
+
+def _join_schemas(
+    metadata: Dict[str, Any],
+    tables: Tuple[str, str],
+) -> Dict[str, Dict[str, Any]]:
+    return {
+        table_name: get_schema(table_name, metadata[table_name])
+        for table_name in tables
+    }
 
-        if match:
-            result.append(record)
-            matched_ids.append(record.get("ID"))
 
-    return {"data": result, "ids": matched_ids, "count": len(result)}
+def _iter_join(
+    metadata: Dict[str, Any],
+    tables: Tuple[str, str],
+    on: Tuple[str, str],
+    pushed: Dict[str, Optional[Tuple]],
+    predicate: Callable[[Dict[str, Any]], bool],
+    limit: Optional[int],
+    offset: int,
+    stage: Stage = lazy_stage,
+) -> Iterator[Dict[str, Any]]:
+    stop = None if limit is None else offset + limit
+    names = [
+        (table_name, get_schema(table_name, metadata[table_name])["names"])
+        for table_name in tables
+    ]
+
+    pairs = stage(
+        "соединение", lambda: _join_pairs(metadata, tables, on, pushed, stage)
+    )
+    joined = (
+        {
+            f"{table_name}.{column}": record.get(column)
+            for (table_name, columns), record in zip(names, pair, strict=True)
+            for column in columns
+        }
+        for pair in pairs
+    )
+    returned = 0
+    for row in stage("фильтр строк", lambda: islice(
+        (row for row in joined if predicate(row)), offset, stop
+    )):
+        returned += 1
+        yield row
+    metrics.increment(
+        "rows_returned_total", returned, table=f"{tables[0]}+{tables[1]}"
+    )
+
+
+def _join_pairs(
+    metadata: Dict[str, Any],
+    tables: Tuple[str, str],
+    on: Tuple[str, str],
+    pushed: Dict[str, Optional[Tuple]],
+    stage: Stage = lazy_stage,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    (left_table, right_table), (left_column, right_column) = tables, on
+    method = _join_method(metadata, tables, on)
+
+    if method == "merge":
+        return merge_join(
+            _join_input(
+                metadata, left_table, pushed[left_table], left_column, stage
+            ),
+            _join_input(
+                metadata, right_table, pushed[right_table], right_column, stage
+            ),
+            left_column,
+            right_column,
+        )
+
+    left_rows = _join_input(metadata, left_table, pushed[left_table], None, stage)
+    right_rows = _join_input(
+        metadata, right_table, pushed[right_table], None, stage
+    )
+    if method == "hash_left":
+        return hash_join(left_rows, right_rows, left_column, right_column, True)
+    return hash_join(right_rows, left_rows, right_column, left_column, False)
+
+
+def _join_method(
+    metadata: Dict[str, Any],
+    tables: Tuple[str, str],
+    on: Tuple[str, str],
+    cache: bool = True,
+) -> str:
+    if all(
+        _table_indexes(table_name, metadata).get(column) == "sorted"
+        for table_name, column in zip(tables, on, strict=True)
+    ):
+        return "merge"
+    if _count_rows(tables[0], cache) <= _count_rows(tables[1], cache):
+        return "hash_left"
+    return "hash_right"
+
+
+def _join_input(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    order_column: Optional[str] = None,
+    stage: Stage = lazy_stage,
+) -> Iterator[Dict[str, Any]]:
+    schema = get_schema(table_name, metadata[table_name])
+    order_by = None if order_column is None else (order_column, False)
+    return _iter_select(
+        metadata,
+        table_name,
+        where,
+        compile_predicate(where, schema),
+        None,
+        0,
+        order_by,
+        lambda name, make: stage(f"{table_name}: {name}", make),
+    )
+
+
+def _matching_positions(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    stage: Stage = lazy_stage,
+) -> Tuple[List[Dict[str, Any]], Dict[str, str], List[int]]:
+    schema = get_schema(table_name, metadata[table_name])
+    predicate = compile_predicate(where, schema)
+
+    data = stage("загрузка таблицы", lambda: load_table_data(table_name))
+    indexed = _table_indexes(table_name, metadata)
+
+    def prepare() -> None:
+        for column, kind in indexed.items():
+            load_index(table_name, column, data, kind)
+        _table_stats(metadata, table_name, lambda: data)
+
+    stage("загрузка индексов и статистики", prepare)
+    positions = stage("поиск строк", lambda: list(
+        _iter_positions(metadata, table_name, data, where, predicate)
+    ))
+    return data, indexed, positions
 
 
 @handle_db_errors
@@ -353,58 +1374,54 @@ def update(
     metadata: Dict[str, Any],
     table_name: str,
     set_clause: Dict[str, Any],
-    where_clause: Dict[str, Any],
+    where_clause: Any,
 ) -> Dict[str, Any]:
     if table_name not in metadata:
         raise KeyError(f"Таблица '{table_name}' не найдена")
 
-    data = load_table_data(table_name)
-    updated_ids = []
-    table_info = metadata[table_name]
+    schema = get_schema(table_name, metadata[table_name])
+    primary_key = schema["primary_key"]
+    if primary_key in set_clause:
+        raise ValueError(f"Нельзя изменять первичный ключ '{primary_key}'")
 
-    for record in data:
-        match = True
-        for column, value in where_clause.items():
-            try:
-                if str(record.get(column, "")) != str(value):
-                    match = False
-                    break
-            except Exception:
-                match = False
-                break
+    converted_set = {}
+    for column, new_value in set_clause.items():
+        converter = schema["converters"].get(column)
+        if converter is None:
+            converted_set[column] = new_value
+            continue
 
-        if match:
-            for column, new_value in set_clause.items():
-                col_type = None
-                for col_def in table_info["columns"]:
-                    if col_def.startswith(column):
-                        parts = col_def.split(" ")
-                        if len(parts) == 1:
-                            col_name_in_def = parts[0]
-                            current_type = "str"
-                        else:
-                            col_name_in_def = " ".join(parts[:-1])
-                            current_type = parts[-1]
-
-                        if col_name_in_def == column:
-                            col_type = current_type
-                            break
-
-                if col_type:
-                    try:
-                        converted_value = convert_to_type(new_value, col_type)
-                        record[column] = converted_value
-                    except Exception as e:
-                        raise ValueError(
-                            f"Ошибка обновления '{column}': {e}"
-                        ) from e
-                else:
-                    record[column] = new_value
+        try:
+            converted_set[column] = converter(new_value)
+        except Exception as e:
+            raise ValueError(f"Ошибка обновления '{column}': {e}") from e
 
-            updated_ids.append(record["ID"])
+    where = normalize_where(where_clause)
+    data, indexed, positions = _matching_positions(metadata, table_name, where)
+
+    updated_ids = []
+    old_values = {}
+    updated_data = list(data)
+    for position in positions:
+        record = data[position]
+        old_values[position] = {
+            column: record.get(column, "") for column in indexed
+        }
+        updated_data[position] = {**record, **converted_set}
+        updated_ids.append(record.get("ID"))
 
     if updated_ids:
-        save_table_data(table_name, data)
+        _log_table_change(
+            table_name,
+            primary_key,
+            {"op": "update", "records": [updated_data[p] for p in positions]},
+            updated_data,
+            positions,
+        )
+        save_table_data(table_name, updated_data)
+        index_update(table_name, indexed, old_values, updated_data)
+        stats_update(table_name, updated_data, positions)
+        _bump_table_version(table_name)
 
     return {"ids": updated_ids, "count": len(updated_ids)}
 
@@ -414,38 +1431,379 @@ def update(
 def delete(
     metadata: Dict[str, Any],
     table_name: str,
-    where_clause: Dict[str, Any],
+    where_clause: Any,
 ) -> Dict[str, Any]:
     if table_name not in metadata:
         raise KeyError(f"Таблица '{table_name}' не найдена")
 
-    data = load_table_data(table_name)
-    deleted_ids = []
-    remaining_data = []
-
-    for record in data:
-        match = True
-        if where_clause:
-            for column, value in where_clause.items():
-                try:
-                    if str(record.get(column, "")) != str(value):
-                        match = False
-                        break
-                except Exception:
-                    match = False
-                    break
-
-        if match:
-            deleted_ids.append(record.get("ID"))
-        else:
-            remaining_data.append(record)
+    where = normalize_where(where_clause)
+    schema = get_schema(table_name, metadata[table_name])
+    data, indexed, positions = _matching_positions(metadata, table_name, where)
+    deleted_ids = [data[position].get("ID") for position in positions]
 
     if deleted_ids:
+        deleted = set(positions)
+        rows_before = len(data)
+        remaining_data = [
+            record for position, record in enumerate(data)
+            if position not in deleted
+        ]
+        primary_key = schema["primary_key"]
+        _log_table_change(
+            table_name,
+            primary_key,
+            {
+                "op": "delete",
+                "ids": [data[position].get(primary_key) for position in positions],
+            },
+            remaining_data,
+        )
         save_table_data(table_name, remaining_data)
+        index_delete(table_name, indexed, positions, rows_before)
+        stats_delete(table_name, remaining_data, positions, rows_before)
+        _bump_table_version(table_name)
 
     return {"ids": deleted_ids, "count": len(deleted_ids)}
 
 
+def _storage_kind(table_name: str, operation: str, columnar: bool) -> str:
+    if columnar:
+        return "columnar"
+    if peek_table_cache(table_name) is not None:
+        return "memory"
+    if operation in ("select", "aggregate") and is_mapped_table(table_name):
+        return "rows"
+    return "file"
+
+
+def _pushed_predicates(
+    where: Optional[Tuple],
+    access: str,
+    used: List[Tuple],
+    schema: Dict[str, Any],
+) -> List[Tuple[str, str]]:
+    pushed = []
+    for term in where_terms(where):
+        if term in used:
+            place = "индекс"
+        elif access in ("columnar", "columnar_zone"):
+            place = "столбцы"
+        elif access == "prefilter" and equality_values(term, schema):
+            place = "поиск в файле"
+        else:
+            place = "фильтр строк"
+        if access in ("zone_map", "columnar_zone"):
+            place = f"зональная карта, {place}"
+        pushed.append((format_where(term), place))
+    return pushed
+
+
+def _access_plan(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where: Optional[Tuple],
+    operation: str,
+    order_by: Optional[Tuple[str, bool]] = None,
+    columns: Optional[List[Optional[str]]] = None,
+) -> Dict[str, Any]:
+    schema = get_schema(table_name, metadata[table_name])
+    indexed = _table_indexes(table_name, metadata)
+    sorted_columns = [c for c, kind in indexed.items() if kind == "sorted"]
+    if operation == "aggregate":
+        columnar = _can_aggregate_columns(metadata, table_name, where)
+    else:
+        columnar = operation == "select" and order_by is None and (
+            _can_scan_columns(metadata, table_name, where)
+        )
+    storage = _storage_kind(table_name, operation, columnar)
+
+    rows = _count_rows(table_name, cache=False)
+    stats = None
+    if where is not None:
+        stats = fresh_table_stats(table_name, schema["names"])
+    summary = summarize_stats(stats) if stats is not None else None
+
+    terms = where_terms(where)
+    lookups = index_lookups(where, indexed, schema)
+    bounds = range_bounds(where, sorted_columns, schema)
+    access, index, used, scanned = "full_scan", None, [], rows
+
+    if columnar:
+        access = "columnar"
+    elif order_by is not None and indexed.get(order_by[0]) == "sorted":
+        access, index = "index_order", order_by[0]
+        bounds = range_bounds(where, [index], schema)
+        if bounds is not None:
+            used = [term for term in terms if _term_column(term) == index]
+            scanned = estimate_range(summary, rows, bounds)
+    elif lookups is not None:
+        access = "index_lookup"
+        index = ", ".join(dict.fromkeys(column for column, _ in lookups))
+        used = [next(
+            term for term in terms
+            if index_lookups(term, indexed, schema) is not None
+        )]
+        scanned = estimate_lookup(summary, rows, lookups)
+    elif bounds is not None:
+        access, index = "index_range", bounds[0]
+        used = [term for term in terms if _term_column(term) == index]
+        scanned = estimate_range(summary, rows, bounds)
+
+    if access in ("columnar", "full_scan") and stats is not None:
+        ranges = matching_ranges(stats, where, schema)
+        if ranges is not None:
+            access = "columnar_zone" if columnar else "zone_map"
+            scanned = sum(stop - start for start, stop in ranges)
+    if access == "full_scan" and where is not None:
+        if parallel_scan_enabled(rows):
+            access = "parallel"
+        elif storage == "rows" and equality_values(where, schema):
+            access = "prefilter"
+
+    return {
+        "operation": operation,
+        "table": table_name,
+        "access": access,
+        "index": index,
+        "storage": storage,
+        "predicates": _pushed_predicates(where, access, used, schema),
+        "rows": rows,
+        "estimated_rows": scanned,
+        "estimated_bytes": _estimate_bytes(
+            table_name, storage, operation, rows, scanned, where, columns
+        ),
+    }
+
+
+def _term_column(term: Tuple) -> Optional[str]:
+    return None if term[0] in ("and", "or") else term[1]
+
+
+def _estimate_bytes(
+    table_name: str,
+    storage: str,
+    operation: str,
+    rows: int,
+    scanned: int,
+    where: Optional[Tuple],
+    columns: Optional[List[Optional[str]]],
+) -> int:
+    snapshot_stamp, log_stamp = get_table_files_stamp(table_name)
+    snapshot_size = snapshot_stamp[1] if snapshot_stamp else 0
+    log_size = log_stamp[1] if log_stamp else 0
+
+    if storage == "memory":
+        return 0
+    if storage == "columnar":
+        needed = {column for column in columns or [] if column}
+        read = table_column_bytes(table_name, needed | where_columns(where))
+        if operation == "select" and scanned:
+            read += snapshot_size
+        return read
+    if storage == "rows":
+        return (snapshot_size * scanned // rows if rows else 0) + log_size
+    return snapshot_size + log_size
+
+
+def _shortcut_plan(
+    operation: str,
+    table_name: str,
+    where: Optional[Tuple],
+    access: str,
+) -> Dict[str, Any]:
+    return {
+        "operation": operation,
+        "table": table_name,
+        "access": access,
+        "index": None,
+        "storage": "memory" if access == "cache" else "statistics",
+        "predicates": [
+            (format_where(term), "кэш") for term in where_terms(where)
+        ],
+        "rows": _count_rows(table_name, cache=False),
+        "estimated_rows": 0,
+        "estimated_bytes": 0,
+    }
+
+
+def _io_counters(tables: List[str]) -> Tuple[float, float]:
+    scanned = metrics.counter_totals("rows_scanned_total", "table")
+    read = metrics.counter_totals("table_bytes_read_total", "table")
+    return (
+        sum(scanned.get(table_name, 0) for table_name in tables),
+        sum(read.get(table_name, 0) for table_name in tables),
+    )
+
+
+def _analyze_plan(
+    plan: Dict[str, Any],
+    tables: List[str],
+    run: Callable[[Stage], Any],
+) -> Dict[str, Any]:
+    stages: List[List[Any]] = []
+    enabled = metrics.enabled()
+    metrics.configure(True)
+    scanned_before, read_before = _io_counters(tables)
+    start = time.perf_counter()
+    try:
+        result = run(stage_timer(stages))
+    finally:
+        elapsed = time.perf_counter() - start
+        scanned_after, read_after = _io_counters(tables)
+        metrics.configure(enabled)
+
+    plan.update(
+        analyzed=True,
+        returned=len(result),
+        actual_rows=int(scanned_after - scanned_before),
+        actual_bytes=int(read_after - read_before),
+        stages=stages,
+        total=elapsed,
+    )
+    return plan
+
+
+def _cached_run(key: Tuple[Any, ...]) -> Callable[[Stage], Any]:
+    return lambda stage: stage("кэш запросов", lambda: result_cache.get(key))
+
+
+@handle_db_errors
+def explain_select(
+    metadata: Dict[str, Any],
+    table_name: str,
+    where_clause: Optional[Any] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    order_by: Optional[Tuple[str, bool]] = None,
+    analyze: bool = False,
+) -> Dict[str, Any]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
+    _check_window(limit, offset)
+
+    where = normalize_where(where_clause)
+    key = _result_key(table_name, "select", where, order_by, limit, offset)
+    if key in result_cache:
+        plan = _shortcut_plan("select", table_name, where, "cache")
+        return _analyze_plan(plan, [table_name], _cached_run(key)) if analyze else plan
+
+    plan = _access_plan(metadata, table_name, where, "select", order_by)
+    if not analyze:
+        return plan
+
+    schema = get_schema(table_name, metadata[table_name])
+    predicate = compile_predicate(where, schema)
+    return _analyze_plan(plan, [table_name], lambda stage: list(_iter_select(
+        metadata, table_name, where, predicate, limit, offset, order_by, stage
+    )))
+
+
+@handle_db_errors
+def explain_aggregate(
+    metadata: Dict[str, Any],
+    table_name: str,
+    aggregates: List[Tuple[str, Optional[str]]],
+    where_clause: Optional[Any] = None,
+    group_by: Optional[str] = None,
+    analyze: bool = False,
+) -> Dict[str, Any]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
+
+    schema = get_schema(table_name, metadata[table_name])
+    validate_aggregates(aggregates, schema, group_by)
+    where = normalize_where(where_clause)
+    key = _result_key(table_name, "aggregate", aggregates, where, group_by)
+    if key in result_cache:
+        plan = _shortcut_plan("aggregate", table_name, where, "cache")
+        return _analyze_plan(plan, [table_name], _cached_run(key)) if analyze else plan
+
+    columns = [column for _, column in aggregates]
+    if group_by is not None:
+        columns.insert(0, group_by)
+    if where is None and group_by is None and all(c is None for c in columns):
+        plan = _shortcut_plan("aggregate", table_name, where, "row_count")
+    else:
+        plan = _access_plan(
+            metadata, table_name, where, "aggregate", columns=columns
+        )
+    if not analyze:
+        return plan
+
+    return _analyze_plan(plan, [table_name], lambda stage: _compute_aggregate(
+        metadata, table_name, aggregates, where, group_by, stage
+    ))
+
+
+@handle_db_errors
+def explain_join(
+    metadata: Dict[str, Any],
+    left_table: str,
+    right_table: str,
+    on: Tuple[str, str],
+    where_clause: Optional[Any] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    analyze: bool = False,
+) -> Dict[str, Any]:
+    tables = (left_table, right_table)
+    pushed, residual = _prepare_join(
+        metadata, tables, on, where_clause, limit, offset
+    )
+    method = _join_method(metadata, tables, on, cache=False)
+    inputs = [
+        _access_plan(
+            metadata,
+            table_name,
+            pushed[table_name],
+            "select",
+            (column, False) if method == "merge" else None,
+        )
+        for table_name, column in zip(tables, on, strict=True)
+    ]
+    plan = {
+        "operation": "join",
+        "tables": list(tables),
+        "method": method,
+        "on": on,
+        "inputs": inputs,
+        "residual": format_where(residual) or None,
+        "estimated_rows": sum(item["estimated_rows"] for item in inputs),
+        "estimated_bytes": sum(item["estimated_bytes"] for item in inputs),
+    }
+    if not analyze:
+        return plan
+
+    schemas = _join_schemas(metadata, tables)
+    predicate = compile_predicate(residual, joined_schema(schemas))
+    return _analyze_plan(plan, list(tables), lambda stage: list(_iter_join(
+        metadata, tables, on, pushed, predicate, limit, offset, stage
+    )))
+
+
+@handle_db_errors
+def explain_write(
+    metadata: Dict[str, Any],
+    operation: str,
+    table_name: str,
+    where_clause: Any,
+    analyze: bool = False,
+) -> Dict[str, Any]:
+    if table_name not in metadata:
+        raise KeyError(f"Таблица '{table_name}' не найдена")
+
+    where = normalize_where(where_clause)
+    plan = _access_plan(metadata, table_name, where, operation)
+    if not analyze:
+        return plan
+
+    return _analyze_plan(
+        plan,
+        [table_name],
+        lambda stage: _matching_positions(metadata, table_name, where, stage)[2],
+    )
+
+
 @handle_db_errors
 def get_table_info(
     metadata: Dict[str, Any],
@@ -454,9 +1812,13 @@ def get_table_info(
     if table_name not in metadata:
         raise KeyError(f"Таблица '{table_name}' не найдена")
 
-    data = load_table_data(table_name)
     table_info = metadata[table_name].copy()
     table_info["name"] = table_name
-    table_info["record_count"] = len(data)
+    table_info["record_count"] = _count_rows(table_name)
+
+    stats = _table_stats(metadata, table_name)
+    if stats is not None:
+        table_info["chunks"] = len(stats["chunks"])
+        table_info["statistics"] = summarize_stats(stats)
 
     return table_info
@@ -1,6 +1,21 @@
 import functools
+import sys
 import time
-from typing import Any, Callable, Dict
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+_auto_confirm = False
+
+
+def set_auto_confirm(enabled: bool) -> None:
+    global _auto_confirm
+    _auto_confirm = enabled
 
 
 def handle_db_errors(func: Callable) -> Callable:
@@ -28,6 +43,15 @@ def confirm_action(action_name: str) -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            if _auto_confirm:
+                return func(*args, **kwargs)
+            if not sys.stdin.isatty():
+                print(
+                    f'Операция "{action_name}" отменена: подтверждение '
+                    "недоступно без терминала, используйте --yes."
+                )
+                return None
+
             prompt = f'\nВы уверены, что хотите выполнить "{action_name}"? [y/n]: '
             print(prompt, end='')
             response = input().strip().lower()
@@ -42,32 +66,146 @@ def confirm_action(action_name: str) -> Callable:
     return decorator
 
 
+def _timed_iterator(iterator: Iterator, name: str, elapsed: float) -> Iterator:
+    try:
+        while True:
+            start_time = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start_time
+            yield item
+    finally:
+        metrics.observe("function_seconds", elapsed, function=name)
+
+
 def log_time(func: Callable) -> Callable:
+    name = func.__name__
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        start_time = time.monotonic()
-        result = func(*args, **kwargs)
-        end_time = time.monotonic()
-
-        elapsed = end_time - start_time
-        print(f"Функция {func.__name__} выполнилась за {elapsed:.3f} секунд")
+        if not metrics.enabled():
+            return func(*args, **kwargs)
 
+        start_time = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            elapsed = time.perf_counter() - start_time
+            metrics.observe("function_seconds", elapsed, function=name)
+            raise
+
+        elapsed = time.perf_counter() - start_time
+        if isinstance(result, Iterator):
+            return _timed_iterator(result, name, elapsed)
+        metrics.observe("function_seconds", elapsed, function=name)
         return result
 
     return wrapper
 
 
-def create_cacher() -> Callable:
-    cache: Dict[str, Any] = {}
-
-    def cache_result(key: str, value_func: Callable) -> Any:
-        if key in cache:
-            print(f"Используется кэшированный результат для ключа: {key}")
-            return cache[key]
-
-        result = value_func()
-        cache[key] = result
-        print(f"Результат закэширован с ключом: {key}")
-        return result
-
-    return cache_result
+_MISSING = object()
+
+
+def approximate_size(value: Any) -> int:
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            approximate_size(key) + approximate_size(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_entry_bytes: Optional[int] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = (
+            max_bytes // 8 if max_entry_bytes is None else max_entry_bytes
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Any]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        size: Optional[int] = None,
+        tag: Any = None,
+    ) -> bool:
+        size = approximate_size(value) if size is None else size
+        if size > self.max_entry_bytes:
+            return False
+
+        self._discard(key)
+        self._entries[key] = (value, size, tag)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+        return True
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def invalidate(self, tag: Any = None) -> int:
+        keys = [
+            key for key, (_, _, entry_tag) in self._entries.items()
+            if tag is None or entry_tag == tag
+        ]
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def __call__(self, key: Hashable, value_func: Callable, tag: Any = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = value_func()
+            self.put(key, value, tag=tag)
+        return value
+
+
+def create_cacher(
+    max_entries: int = 256,
+    max_bytes: int = 32 * 1024 * 1024,
+) -> ResultCache:
+    return ResultCache(max_entries, max_bytes)
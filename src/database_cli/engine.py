@@ -1,34 +1,127 @@
 import os
+import re
 import sys
+import time
 
 from prettytable import PrettyTable
 
+DISPLAY_PAGE_SIZE = 50
+SCRIPT_SYNC_EVERY = 100
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from core import (
+    from . import metrics
+    from .core import (
+        aggregate,
+        begin,
+        cache_stats,
+        clear_cache,
+        commit,
+        create_index,
         create_table,
         delete,
         drop_table,
+        explain_aggregate,
+        explain_join,
+        explain_select,
+        explain_write,
         get_table_info,
+        import_csv,
         insert,
+        insert_many,
+        join,
         list_tables,
+        rollback,
         select,
+        set_storage,
         update,
     )
-    from parser import (
+    from .parser import (
+        is_aggregate_select,
+        is_join_select,
+        parse_aggregate,
         parse_create,
+        parse_create_index,
         parse_delete,
         parse_drop,
+        parse_explain,
+        parse_import,
         parse_info,
         parse_insert,
+        parse_join,
         parse_select,
+        parse_stats,
+        parse_storage,
         parse_update,
     )
-    from utils import save_metadata
-except ImportError as e:
-    print(f"Ошибка импорта: {e}")
-    sys.exit(1)
+    from .planner import ACCESS_PATHS
+    from .utils import (
+        checkpoint,
+        commit_changes,
+        database_lock,
+        in_transaction,
+        refresh_metadata,
+        save_metadata,
+    )
+except ImportError:
+    try:
+        import metrics
+        from core import (
+            aggregate,
+            begin,
+            cache_stats,
+            clear_cache,
+            commit,
+            create_index,
+            create_table,
+            delete,
+            drop_table,
+            explain_aggregate,
+            explain_join,
+            explain_select,
+            explain_write,
+            get_table_info,
+            import_csv,
+            insert,
+            insert_many,
+            join,
+            list_tables,
+            rollback,
+            select,
+            set_storage,
+            update,
+        )
+        from parser import (
+            is_aggregate_select,
+            is_join_select,
+            parse_aggregate,
+            parse_create,
+            parse_create_index,
+            parse_delete,
+            parse_drop,
+            parse_explain,
+            parse_import,
+            parse_info,
+            parse_insert,
+            parse_join,
+            parse_select,
+            parse_stats,
+            parse_storage,
+            parse_update,
+        )
+        from planner import ACCESS_PATHS
+        from utils import (
+            checkpoint,
+            commit_changes,
+            database_lock,
+            in_transaction,
+            refresh_metadata,
+            save_metadata,
+        )
+    except ImportError as e:
+        print(f"Ошибка импорта: {e}")
+        sys.exit(1)
 
 
 def display_welcome():
@@ -39,18 +132,68 @@ def display_welcome():
     print("Функции:")
     print("<command> create <имя_таблицы> (<столбец1 тип1>, ...)")
     print("<command> drop <имя_таблицы> - удалить таблицу.")
+    print("<command> create index <имя_таблицы> (<столбец>) - создать индекс.")
+    print(
+        "<command> create sorted index <имя_таблицы> (<столбец>) "
+        "- создать упорядоченный индекс."
+    )
     print("<command> list - вывести список всех таблиц.")
+    print(
+        "<command> cache [clear] - статистика кэша результатов запросов "
+        "(или его очистка)."
+    )
     print("\n***Операции с данными***\n")
     print("Функции:")
     print("<command> insert <имя_таблицы> values (<значение1>, ...) - создать запись.")
+    print("<command> insert <имя_таблицы> values (...), (...) - создать несколько.")
+    print("<command> import <имя_таблицы> from <файл.csv> - загрузить записи из CSV.")
     print("<command> select <имя_таблицы> where <столбец> = <значение>")
     print("<command> select <имя_таблицы> - прочитать все записи.")
+    print("<command> select <имя_таблицы> ... order by <столбец> [asc|desc]")
+    print("<command> select <имя_таблицы> ... limit <n> offset <m>")
+    print(
+        "<command> select count(*), sum(<столбец>), avg(...), min(...), max(...) "
+        "from <имя_таблицы> [where ...] [group by <столбец>]"
+    )
+    print(
+        "<command> select <таблица1> join <таблица2> "
+        "on <таблица1>.<столбец> = <таблица2>.<столбец> [where ...]"
+    )
+    print(
+        "  условия where: =, !=, <, <=, >, >=, in (...), "
+        "between ... and ..., and, or, скобки"
+    )
     print(
         "<command> update <имя_таблицы> set <столбец1> = <новое_значение1> "
         "where <столбец_условия> = <значение_условия>"
     )
     print("<command> delete <имя_таблицы> where <столбец> = <значение>")
-    print("<command> info <имя_таблицы> - вывести информацию о таблице.")
+    print(
+        "<command> info <имя_таблицы> - вывести информацию "
+        "и статистику столбцов таблицы."
+    )
+    print(
+        "<command> storage <имя_таблицы> <json|columnar|rows> "
+        "- сменить формат хранения таблицы."
+    )
+    print(
+        "<command> stats [reset|on|off] - метрики: задержки команд, строки, "
+        "ввод-вывод, кэши."
+    )
+    print(
+        "<command> stats dump <файл> [json|prometheus] - выгрузить метрики в файл."
+    )
+    print(
+        "<command> explain [analyze] <select|update|delete ...> - план запроса "
+        "и оценка числа строк и байт."
+    )
+    print(
+        "  analyze выполняет поиск строк и замеряет этапы, данные не изменяются."
+    )
+    print("\n***Транзакции***\n")
+    print("<command> begin - начать транзакцию.")
+    print("<command> commit - записать все изменения транзакции на диск.")
+    print("<command> rollback - отменить изменения транзакции.")
     print("<command> exit - выход из программы")
     print("\nПримеры команд:")
     print("create users (ID int, Name str, Age int)")
@@ -60,15 +203,28 @@ def display_welcome():
     print("=" * 60)
 
 
-def display_table(data):
-    if not data:
-        print("Нет данных для отображения")
-        return
+def display_table(data) -> int:
+    count = 0
+    page = []
+
+    for record in data:
+        page.append(record)
+        count += 1
+        if len(page) >= DISPLAY_PAGE_SIZE:
+            _print_page(page)
+            page = []
 
+    if page:
+        _print_page(page)
+
+    return count
+
+
+def _print_page(page) -> None:
     table = PrettyTable()
-    table.field_names = data[0].keys()
+    table.field_names = page[0].keys()
 
-    for record in data:
+    for record in page:
         row = []
         for key in table.field_names:
             row.append(record.get(key, ""))
@@ -77,15 +233,254 @@ def display_table(data):
     print(table)
 
 
-def execute_command(command: str, metadata: dict) -> bool:
+def _print_inserted(result: dict, table_name: str) -> None:
+    if result["count"] == 0:
+        print("Нет записей для добавления.")
+        return
+    print(
+        f"Добавлено записей: {result['count']} "
+        f"(ID={result['ids'][0]}..{result['ids'][-1]}) "
+        f"в таблицу '{table_name}'."
+    )
+
+
+_SHARED_COMMANDS = (
+    "select", "info", "list", "help", "begin", "rollback", "cache", "stats",
+    "explain",
+)
+
+
+def _needs_exclusive_lock(lower_command: str) -> bool:
+    if lower_command.startswith(_SHARED_COMMANDS):
+        return False
+    if in_transaction():
+        return lower_command in ("commit", "exit")
+    return True
+
+
+def _command_label(command: str, lower_command: str) -> str:
+    if is_join_select(command):
+        return "join"
+    if is_aggregate_select(command):
+        return "aggregate"
+    return lower_command.split(None, 1)[0] if lower_command else ""
+
+
+def execute_command(command: str, metadata: dict, sync: bool = True) -> bool:
     lower_command = command.lower().strip()
+    start_time = time.perf_counter() if metrics.enabled() else None
+
+    try:
+        with database_lock(exclusive=_needs_exclusive_lock(lower_command)):
+            refresh_metadata(metadata)
+            return _execute_command(command, lower_command, metadata, sync)
+    finally:
+        if start_time is not None:
+            metrics.observe(
+                "command_seconds",
+                time.perf_counter() - start_time,
+                command=_command_label(command, lower_command),
+            )
+
+
+_STORAGE_LABELS = {
+    "memory": "в памяти процесса",
+    "columnar": "столбцовый файл",
+    "rows": "построчный файл (mmap)",
+    "file": "чтение файла таблицы целиком",
+    "statistics": "статистика таблицы",
+}
+
+_JOIN_METHODS = {
+    "merge": "слиянием по упорядоченным индексам",
+    "hash_left": "хешированием по левой таблице",
+    "hash_right": "хешированием по правой таблице",
+}
+
+
+def _explain(command: str, metadata: dict) -> None:
+    analyze, statement = parse_explain(command)
+    lower_statement = statement.lower()
+
+    if is_join_select(statement):
+        left_table, right_table, on, where_clause, limit, offset = parse_join(
+            statement
+        )
+        plan = explain_join(
+            metadata, left_table, right_table, on, where_clause, limit, offset,
+            analyze,
+        )
+    elif is_aggregate_select(statement):
+        table_name, aggregates, where_clause, group_by = parse_aggregate(
+            statement
+        )
+        plan = explain_aggregate(
+            metadata, table_name, aggregates, where_clause, group_by, analyze
+        )
+    elif lower_statement.startswith("select"):
+        table_name, where_clause, order_by, limit, offset = parse_select(
+            statement
+        )
+        plan = explain_select(
+            metadata, table_name, where_clause, limit, offset, order_by, analyze
+        )
+    elif lower_statement.startswith("update"):
+        table_name, _, where_clause = parse_update(statement)
+        plan = explain_write(metadata, "update", table_name, where_clause, analyze)
+    elif lower_statement.startswith("delete"):
+        table_name, where_clause = parse_delete(statement)
+        plan = explain_write(metadata, "delete", table_name, where_clause, analyze)
+    else:
+        raise ValueError("EXPLAIN поддерживает только select, update и delete")
+
+    if plan is None:
+        return
+    if plan["operation"] == "join":
+        _print_join_plan(plan)
+    else:
+        _print_access_plan(plan, "")
+    if plan.get("analyzed"):
+        _print_analysis(plan)
+
+
+def _print_access_plan(plan: dict, indent: str) -> None:
+    access = ACCESS_PATHS[plan["access"]]
+    if plan["index"]:
+        access += f" ({plan['index']})"
+    print(f"{indent}{plan['operation']} {plan['table']}: {access}")
+    print(f"{indent}  Данные: {_STORAGE_LABELS[plan['storage']]}")
+    for text, place in plan["predicates"]:
+        print(f"{indent}  Условие {text} -> {place}")
+    print(
+        f"{indent}  Оценка: просмотр {plan['estimated_rows']} "
+        f"из {plan['rows']} строк, чтение {plan['estimated_bytes']} байт"
+    )
+
+
+def _print_join_plan(plan: dict) -> None:
+    left_table, right_table = plan["tables"]
+    left_column, right_column = plan["on"]
+    print(
+        f"join {left_table}.{left_column} = {right_table}.{right_column}: "
+        f"{_JOIN_METHODS[plan['method']]}"
+    )
+    for item in plan["inputs"]:
+        _print_access_plan(item, "  ")
+    if plan["residual"]:
+        print(f"  Условие после соединения: {plan['residual']}")
+    print(
+        f"  Оценка: просмотр {plan['estimated_rows']} строк, "
+        f"чтение {plan['estimated_bytes']} байт"
+    )
+
+
+def _print_analysis(plan: dict) -> None:
+    writes = plan["operation"] in ("update", "delete")
+    label = "подходящих строк" if writes else "возвращено строк"
+    print(
+        f"Фактически: просмотрено {plan['actual_rows']} строк, "
+        f"прочитано {plan['actual_bytes']} байт, {label}: {plan['returned']}"
+    )
+    for name, seconds in plan["stages"]:
+        print(f"  {name}: {seconds * 1000:.3f} мс")
+    print(f"Общее время: {plan['total'] * 1000:.3f} мс")
+    if writes:
+        print("Изменения не применялись.")
+
+
+def _print_metrics() -> None:
+    data = metrics.snapshot()
+    state = "включён" if data["enabled"] else "выключен"
+    print(f"Сбор метрик {state}.")
 
+    commands = [h for h in data["histograms"] if h["name"] == "command_seconds"]
+    if commands:
+        table = PrettyTable()
+        table.field_names = [
+            "команда", "вызовов", "среднее, мс", "p50, мс", "p95, мс", "макс, мс"
+        ]
+        for histogram in sorted(commands, key=lambda h: -h["sum"]):
+            table.add_row([
+                histogram["labels"].get("command", ""),
+                histogram["count"],
+                f"{histogram['sum'] / histogram['count'] * 1000:.2f}",
+                f"{metrics.quantile(histogram, 0.5) * 1000:.2f}",
+                f"{metrics.quantile(histogram, 0.95) * 1000:.2f}",
+                f"{histogram['max'] * 1000:.2f}",
+            ])
+        print(table)
+
+    columns = {
+        "просмотрено строк": metrics.counter_totals("rows_scanned_total", "table"),
+        "возвращено строк": metrics.counter_totals("rows_returned_total", "table"),
+        "прочитано байт": metrics.counter_totals("table_bytes_read_total", "table"),
+        "записано байт": metrics.counter_totals("table_bytes_written_total", "table"),
+        "попаданий в кэш": metrics.counter_totals("table_cache_hits_total", "table"),
+    }
+    tables = sorted({name for totals in columns.values() for name in totals})
+    if tables:
+        table = PrettyTable()
+        table.field_names = ["таблица", *columns]
+        for name in tables:
+            table.add_row([
+                name, *(int(totals.get(name, 0)) for totals in columns.values())
+            ])
+        print(table)
+
+    gauges = data["gauges"]
+    if "result_cache_hits" in gauges:
+        print(
+            f"Кэш запросов: попаданий {gauges['result_cache_hits']}, "
+            f"промахов {gauges['result_cache_misses']}"
+        )
+
+
+def _execute_command(
+    command: str,
+    lower_command: str,
+    metadata: dict,
+    sync: bool,
+) -> bool:
     if lower_command == "exit":
+        if in_transaction():
+            rollback(metadata)
+            print("Незавершённая транзакция отменена.")
+        checkpoint()
         print("Выход из программы.")
         return False
+    elif lower_command == "begin":
+        if begin(metadata) is not None:
+            print("Транзакция начата.")
+        return True
+    elif lower_command == "commit":
+        result = commit(metadata)
+        if result is not None:
+            commit_changes()
+            print("Транзакция зафиксирована.")
+        return True
+    elif lower_command == "rollback":
+        if rollback(metadata) is not None:
+            print("Транзакция отменена.")
+        return True
     elif lower_command == "help":
         display_welcome()
         return True
+    elif lower_command == "cache":
+        stats = cache_stats()
+        requests = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / requests * 100 if requests else 0.0
+        print(
+            f"Кэш запросов: попаданий {stats['hits']}, промахов {stats['misses']} "
+            f"({ratio:.1f}% попаданий), вытеснено {stats['evictions']}"
+        )
+        print(
+            f"  Записей: {stats['entries']} из {stats['max_entries']}, "
+            f"объём: {stats['bytes']} из {stats['max_bytes']} байт"
+        )
+        return True
+    elif lower_command == "cache clear":
+        print(f"Кэш запросов очищен, удалено записей: {clear_cache()}.")
+        return True
     elif lower_command == "list":
         result = list_tables(metadata)
         if result is None:
@@ -99,7 +494,22 @@ def execute_command(command: str, metadata: dict) -> bool:
         return True
 
     try:
-        if lower_command.startswith("create"):
+        if re.match(r'create\s+(sorted\s+)?index\b', lower_command):
+            table_name, column, kind = parse_create_index(command)
+            result = create_index(metadata, table_name, column, kind)
+            if result is None:
+                return True
+            try:
+                save_metadata(result)
+                print(
+                    f"Индекс по столбцу '{column}' таблицы "
+                    f"'{table_name}' успешно создан."
+                )
+            except Exception as e:
+                print(f"Ошибка при сохранении метаданных: {e}")
+                return True
+
+        elif lower_command.startswith("create"):
             table_name, columns = parse_create(command)
             result = create_table(metadata, table_name, columns)
             if result is None:
@@ -124,23 +534,70 @@ def execute_command(command: str, metadata: dict) -> bool:
                 return True
 
         elif lower_command.startswith("insert"):
-            table_name, values = parse_insert(command)
-            result = insert(metadata, table_name, values)
+            table_name, rows = parse_insert(command)
+            if len(rows) == 1:
+                result = insert(metadata, table_name, rows[0])
+                if result is None:
+                    return True
+                print(
+                    f"Запись с ID={result['id']} успешно добавлена "
+                    f"в таблицу '{table_name}'."
+                )
+            else:
+                result = insert_many(metadata, table_name, rows)
+                if result is None:
+                    return True
+                _print_inserted(result, table_name)
+
+        elif lower_command.startswith("import"):
+            table_name, file_path = parse_import(command)
+            result = import_csv(metadata, table_name, file_path)
             if result is None:
                 return True
-            print(
-                f"Запись с ID={result['id']} успешно добавлена "
-                f"в таблицу '{table_name}'."
+            _print_inserted(result, table_name)
+
+        elif lower_command.startswith("explain"):
+            _explain(command, metadata)
+
+        elif is_join_select(command):
+            left_table, right_table, on, where_clause, limit, offset = parse_join(
+                command
+            )
+            result = join(
+                metadata, left_table, right_table, on, where_clause, limit, offset
+            )
+            if result is None:
+                return True
+            count = display_table(result)
+            if count:
+                print(f"Найдено записей: {count}")
+            else:
+                print("Записи не найдены.")
+
+        elif is_aggregate_select(command):
+            table_name, aggregates, where_clause, group_by = parse_aggregate(
+                command
+            )
+            result = aggregate(
+                metadata, table_name, aggregates, where_clause, group_by
             )
+            if result is None:
+                return True
+            if not display_table(result):
+                print("Записи не найдены.")
 
         elif lower_command.startswith("select"):
-            table_name, where_clause = parse_select(command)
-            result = select(metadata, table_name, where_clause)
+            table_name, where_clause, order_by, limit, offset = parse_select(
+                command
+            )
+            result = select(
+                metadata, table_name, where_clause, limit, offset, order_by
+            )
             if result is None:
                 return True
-            if result["data"]:
-                display_table(result["data"])
-                print(f"Найдено записей: {result['count']}")
+            count = display_table(result)
+            if count:
+                print(f"Найдено записей: {count}")
             else:
                 print("Записи не найдены.")
 
@@ -180,11 +637,87 @@ def execute_command(command: str, metadata: dict) -> bool:
             print(f"Информация о таблице '{table_name}':")
             print(f"  Столбцы: {result['columns']}")
             print(f"  Количество записей: {result['record_count']}")
+            statistics = result.get("statistics")
+            if statistics:
+                print(f"  Статистика столбцов (блоков: {result['chunks']}):")
+                for column, column_stats in statistics.items():
+                    print(
+                        f"    {column}: min={column_stats['min']}, "
+                        f"max={column_stats['max']}, "
+                        f"пустых={column_stats['nulls']}, "
+                        f"различных≈{column_stats['distinct']}"
+                    )
+
+        elif lower_command.startswith("stats"):
+            action, path, fmt = parse_stats(command)
+            if action == "show":
+                _print_metrics()
+            elif action == "reset":
+                metrics.reset()
+                print("Метрики сброшены.")
+            elif action in ("on", "off"):
+                metrics.configure(action == "on")
+                state = "включён" if action == "on" else "выключен"
+                print(f"Сбор метрик {state}.")
+            else:
+                fmt = metrics.dump(path, fmt)
+                print(f"Метрики записаны в '{path}' (формат {fmt}).")
+
+        elif lower_command.startswith("storage"):
+            table_name, storage = parse_storage(command)
+            result = set_storage(metadata, table_name, storage)
+            if result is None:
+                return True
+            save_metadata(result)
+            print(
+                f"Таблица '{table_name}' переведена "
+                f"в формат хранения '{storage}'."
+            )
 
         else:
             print("Неизвестная команда. Введите 'help' для справки.")
 
     except Exception as e:
         print(f"Ошибка выполнения команды: {e}")
+    finally:
+        if sync:
+            commit_changes()
 
     return True
+
+
+def _script_commands(lines):
+    for line in lines:
+        command = line.strip()
+        if command.endswith(";"):
+            command = command[:-1].rstrip()
+        if not command or command.startswith(("--", "#")):
+            continue
+        yield command
+
+
+def run_script(lines, metadata: dict) -> int:
+    executed = 0
+    start_time = time.perf_counter()
+
+    try:
+        for command in _script_commands(lines):
+            executed += 1
+            if not execute_command(command, metadata, sync=False):
+                break
+            if executed % SCRIPT_SYNC_EVERY == 0:
+                commit_changes()
+
+        if in_transaction():
+            rollback(metadata)
+            print("Незавершённая транзакция отменена.")
+    finally:
+        checkpoint()
+
+    elapsed = time.perf_counter() - start_time
+    rate = executed / elapsed if elapsed > 0 else 0.0
+    print(
+        f"\nВыполнено команд: {executed} за {elapsed:.3f} с "
+        f"({rate:.1f} команд/с)"
+    )
+    return executed
@@ -0,0 +1,354 @@
+import json
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .utils import (
+        get_table_files_stamp,
+        holds_shared_lock,
+        in_transaction,
+        write_file_atomic,
+    )
+except ImportError:
+    from utils import (
+        get_table_files_stamp,
+        holds_shared_lock,
+        in_transaction,
+        write_file_atomic,
+    )
+
+_index_cache: Dict[str, Dict[str, Any]] = {}
+_INDEX_SUFFIXES = {"hash": "idx", "sorted": "sidx"}
+
+
+def _index_file(table_name: str, column: str, kind: str = "hash") -> Path:
+    return Path("data") / f"{table_name}.{column}.{_INDEX_SUFFIXES[kind]}.json"
+
+
+def _snapshot_stamp(table_name: str) -> Optional[List[int]]:
+    stamp = get_table_files_stamp(table_name)[0]
+    return list(stamp) if stamp else None
+
+
+def index_key(value: Any) -> str:
+    return str(value)
+
+
+def _family(value: Any) -> Optional[str]:
+    if isinstance(value, (bool, int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "str"
+    return None
+
+
+def _sorted_slot(index: Dict[str, Any], value: Any, position: int) -> int:
+    keys = index["keys"]
+    low = bisect_left(keys, value)
+    high = bisect_right(keys, value, low)
+    return bisect_left(index["positions"], position, low, high)
+
+
+def _index_add(index: Dict[str, Any], value: Any, position: int) -> None:
+    if index["kind"] == "hash":
+        index["map"].setdefault(index_key(value), []).append(position)
+        return
+
+    family = _family(value)
+    if index["family"] is None and family is not None:
+        index["family"] = family
+    if family is None or family != index["family"]:
+        insort(index["nulls"], position)
+        return
+
+    slot = _sorted_slot(index, value, position)
+    index["keys"].insert(slot, value)
+    index["positions"].insert(slot, position)
+
+
+def _index_remove(index: Dict[str, Any], value: Any, position: int) -> None:
+    if index["kind"] == "hash":
+        key = index_key(value)
+        bucket = index["map"].get(key, [])
+        if position in bucket:
+            bucket.remove(position)
+        if not bucket:
+            index["map"].pop(key, None)
+        return
+
+    if _family(value) == index["family"]:
+        slot = _sorted_slot(index, value, position)
+        if slot < len(index["positions"]) and index["positions"][slot] == position:
+            del index["keys"][slot]
+            del index["positions"][slot]
+            return
+
+    nulls = index["nulls"]
+    slot = bisect_left(nulls, position)
+    if slot < len(nulls) and nulls[slot] == position:
+        del nulls[slot]
+
+
+def build_index(
+    table_name: str,
+    column: str,
+    data: List[Dict[str, Any]],
+    kind: str = "hash",
+) -> Dict[str, Any]:
+    if kind == "hash":
+        index_map: Dict[str, List[int]] = {}
+        for position, record in enumerate(data):
+            key = index_key(record.get(column, ""))
+            index_map.setdefault(key, []).append(position)
+        index = {"kind": "hash", "map": index_map, "rows": len(data)}
+    else:
+        values = [record.get(column) for record in data]
+        family = next(
+            (_family(value) for value in values if _family(value)), None
+        )
+        entries = []
+        nulls = []
+        for position, value in enumerate(values):
+            if family is not None and _family(value) == family:
+                entries.append((value, position))
+            else:
+                nulls.append(position)
+        entries.sort()
+        index = {
+            "kind": "sorted",
+            "family": family,
+            "keys": [value for value, _ in entries],
+            "positions": [position for _, position in entries],
+            "nulls": nulls,
+            "rows": len(data),
+        }
+
+    _index_cache[f"{table_name}.{column}"] = index
+    save_index(table_name, column)
+    return index
+
+
+def save_index(table_name: str, column: str) -> None:
+    index = _index_cache.get(f"{table_name}.{column}")
+    if index is None or in_transaction() or holds_shared_lock():
+        return
+
+    data_dir = Path("data")
+    data_dir.mkdir(exist_ok=True)
+
+    index["stamp"] = _snapshot_stamp(table_name)
+    index_file = _index_file(table_name, column, index["kind"])
+    write_file_atomic(index_file, json.dumps(index, ensure_ascii=False))
+
+
+def load_index(
+    table_name: str,
+    column: str,
+    data: List[Dict[str, Any]],
+    kind: str = "hash",
+) -> Dict[str, Any]:
+    stamp = _snapshot_stamp(table_name)
+    index = _index_cache.get(f"{table_name}.{column}")
+
+    if index is None or index.get("stamp") != stamp or index["kind"] != kind:
+        index = None
+        index_file = _index_file(table_name, column, kind)
+        if index_file.exists():
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                index = None
+
+        if index is None or index.get("stamp") != stamp:
+            return build_index(table_name, column, data, kind)
+
+        index.setdefault("kind", kind)
+        _index_cache[f"{table_name}.{column}"] = index
+
+    if index["rows"] > len(data):
+        return build_index(table_name, column, data, kind)
+
+    for position in range(index["rows"], len(data)):
+        default = "" if kind == "hash" else None
+        _index_add(index, data[position].get(column, default), position)
+    index["rows"] = len(data)
+
+    return index
+
+
+def lookup_index(
+    table_name: str,
+    column: str,
+    value: Any,
+    data: List[Dict[str, Any]],
+    kind: str = "hash",
+) -> List[int]:
+    index = load_index(table_name, column, data, kind)
+    if kind == "hash":
+        return index["map"].get(index_key(value), [])
+
+    if _family(value) != index["family"]:
+        return index["nulls"]
+
+    low = bisect_left(index["keys"], value)
+    high = bisect_right(index["keys"], value, low)
+    return index["positions"][low:high]
+
+
+def range_index(
+    table_name: str,
+    column: str,
+    data: List[Dict[str, Any]],
+    low: Any = None,
+    high: Any = None,
+    low_inclusive: bool = True,
+    high_inclusive: bool = True,
+) -> Optional[List[int]]:
+    index = load_index(table_name, column, data, "sorted")
+    keys = index["keys"]
+
+    for bound in (low, high):
+        if bound is not None and _family(bound) != index["family"]:
+            return None
+
+    start = 0
+    if low is not None:
+        start = bisect_left(keys, low) if low_inclusive else bisect_right(keys, low)
+    end = len(keys)
+    if high is not None:
+        end = bisect_right(keys, high) if high_inclusive else bisect_left(keys, high)
+
+    return index["positions"][start:max(start, end)]
+
+
+def ordered_positions(
+    table_name: str,
+    column: str,
+    data: List[Dict[str, Any]],
+    descending: bool = False,
+) -> List[int]:
+    index = load_index(table_name, column, data, "sorted")
+    if not descending:
+        return index["positions"] + index["nulls"]
+
+    keys = index["keys"]
+    positions = index["positions"]
+    ordered = []
+    end = len(keys)
+    while end > 0:
+        start = bisect_left(keys, keys[end - 1], 0, end)
+        ordered.extend(positions[start:end])
+        end = start
+    return ordered + index["nulls"]
+
+
+def index_insert(
+    table_name: str,
+    indexed: Dict[str, str],
+    record: Dict[str, Any],
+    position: int,
+) -> None:
+    for column, kind in indexed.items():
+        index = _index_cache.get(f"{table_name}.{column}")
+        if index is None or index["kind"] != kind or index["rows"] != position:
+            continue
+        default = "" if kind == "hash" else None
+        _index_add(index, record.get(column, default), position)
+        index["rows"] = position + 1
+
+
+def index_update(
+    table_name: str,
+    indexed: Dict[str, str],
+    old_values: Dict[int, Dict[str, Any]],
+    data: List[Dict[str, Any]],
+) -> None:
+    for column, kind in indexed.items():
+        index = _index_cache.get(f"{table_name}.{column}")
+        if index is None or index["kind"] != kind or index["rows"] != len(data):
+            _index_cache.pop(f"{table_name}.{column}", None)
+            continue
+
+        default = "" if kind == "hash" else None
+        for position, old_record in old_values.items():
+            old_value = old_record.get(column, default)
+            new_value = data[position].get(column, default)
+            if old_value == new_value and type(old_value) is type(new_value):
+                continue
+
+            _index_remove(index, old_value, position)
+            if kind == "hash":
+                bucket = index["map"].setdefault(index_key(new_value), [])
+                if position not in bucket:
+                    insort(bucket, position)
+            else:
+                _index_add(index, new_value, position)
+
+        save_index(table_name, column)
+
+
+def index_delete(
+    table_name: str,
+    indexed: Dict[str, str],
+    deleted_positions: List[int],
+    rows_before: int,
+) -> None:
+    deleted = set(deleted_positions)
+    remap = {}
+    shift = 0
+    for position in range(rows_before):
+        if position in deleted:
+            shift += 1
+        else:
+            remap[position] = position - shift
+
+    for column, kind in indexed.items():
+        index = _index_cache.get(f"{table_name}.{column}")
+        if index is None or index["kind"] != kind or index["rows"] != rows_before:
+            _index_cache.pop(f"{table_name}.{column}", None)
+            continue
+
+        if kind == "hash":
+            new_map = {}
+            for key, positions in index["map"].items():
+                kept = [remap[p] for p in positions if p not in deleted]
+                if kept:
+                    new_map[key] = kept
+            index["map"] = new_map
+        else:
+            kept = [
+                (key, remap[p])
+                for key, p in zip(index["keys"], index["positions"], strict=True)
+                if p not in deleted
+            ]
+            index["keys"] = [key for key, _ in kept]
+            index["positions"] = [p for _, p in kept]
+            index["nulls"] = [remap[p] for p in index["nulls"] if p not in deleted]
+
+        index["rows"] = rows_before - len(deleted)
+        save_index(table_name, column)
+
+
+def drop_table_indexes(table_name: str, indexed: Dict[str, str]) -> None:
+    for column, kind in indexed.items():
+        _index_cache.pop(f"{table_name}.{column}", None)
+        index_file = _index_file(table_name, column, kind)
+        if index_file.exists():
+            index_file.unlink()
+
+
+def _table_index_columns(table_name: str) -> List[str]:
+    prefix = f"{table_name}."
+    return [key[len(prefix):] for key in _index_cache if key.startswith(prefix)]
+
+
+def flush_table_indexes(table_name: str) -> None:
+    for column in _table_index_columns(table_name):
+        save_index(table_name, column)
+
+
+def forget_table_indexes(table_name: str) -> None:
+    for column in _table_index_columns(table_name):
+        _index_cache.pop(f"{table_name}.{column}", None)
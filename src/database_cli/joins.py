@@ -0,0 +1,161 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from .predicates import value_family
+except ImportError:
+    from predicates import value_family
+
+Row = Dict[str, Any]
+
+
+def resolve_column(name: str, schemas: Dict[str, Dict[str, Any]]) -> str:
+    if "." in name:
+        table_name, column = name.split(".", 1)
+        if table_name not in schemas:
+            raise KeyError(f"Таблица '{table_name}' не участвует в соединении")
+        if column not in schemas[table_name]["positions"]:
+            raise KeyError(
+                f"Столбец '{column}' не найден в таблице '{table_name}'"
+            )
+        return name
+
+    owners = [
+        table_name for table_name, schema in schemas.items()
+        if name in schema["positions"]
+    ]
+    if not owners:
+        raise KeyError(f"Столбец '{name}' не найден")
+    if len(owners) > 1:
+        raise ValueError(
+            f"Столбец '{name}' есть в обеих таблицах, укажите <таблица>.{name}"
+        )
+    return f"{owners[0]}.{name}"
+
+
+def _rename_columns(node: Tuple, rename: Callable[[str], str]) -> Tuple:
+    if node[0] in ("and", "or"):
+        return (node[0], *(_rename_columns(child, rename) for child in node[1:]))
+    return (node[0], rename(node[1]), *node[2:])
+
+
+def _node_tables(node: Tuple) -> Set[str]:
+    if node[0] in ("and", "or"):
+        tables = set()
+        for child in node[1:]:
+            tables |= _node_tables(child)
+        return tables
+    return {node[1].split(".", 1)[0]}
+
+
+def _conjunction(terms: List[Tuple]) -> Optional[Tuple]:
+    if not terms:
+        return None
+    if len(terms) == 1:
+        return terms[0]
+    return ("and", *terms)
+
+
+def split_join_where(
+    where: Optional[Tuple],
+    schemas: Dict[str, Dict[str, Any]],
+) -> Tuple[Dict[str, Optional[Tuple]], Optional[Tuple]]:
+    pushed: Dict[str, List[Tuple]] = {table_name: [] for table_name in schemas}
+    residual = []
+
+    if where is not None:
+        terms = where[1:] if where[0] == "and" else (where,)
+        for term in terms:
+            qualified = _rename_columns(
+                term, lambda name: resolve_column(name, schemas)
+            )
+            tables = _node_tables(qualified)
+            if len(tables) == 1:
+                pushed[tables.pop()].append(_rename_columns(
+                    qualified, lambda name: name.split(".", 1)[1]
+                ))
+            else:
+                residual.append(qualified)
+
+    return (
+        {table_name: _conjunction(terms) for table_name, terms in pushed.items()},
+        _conjunction(residual),
+    )
+
+
+def joined_schema(schemas: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "converters": {
+            f"{table_name}.{column}": converter
+            for table_name, schema in schemas.items()
+            for column, converter in schema["converters"].items()
+        }
+    }
+
+
+def hash_join(
+    build_rows: Iterable[Row],
+    probe_rows: Iterable[Row],
+    build_key: str,
+    probe_key: str,
+    build_is_left: bool,
+) -> Iterator[Tuple[Row, Row]]:
+    buckets: Dict[Any, List[Row]] = {}
+    for row in build_rows:
+        key = row.get(build_key)
+        if key is not None:
+            buckets.setdefault(key, []).append(row)
+
+    for row in probe_rows:
+        key = row.get(probe_key)
+        if key is None:
+            continue
+        for match in buckets.get(key, ()):
+            yield (match, row) if build_is_left else (row, match)
+
+
+def _key_groups(
+    rows: Iterable[Row],
+    column: str,
+) -> Iterator[Tuple[Any, List[Row]]]:
+    group: List[Row] = []
+    group_key = None
+    for row in rows:
+        key = row.get(column)
+        if value_family(key) is None:
+            break
+        if group and key != group_key:
+            yield group_key, group
+            group = []
+        group_key = key
+        group.append(row)
+    if group:
+        yield group_key, group
+
+
+def merge_join(
+    left_rows: Iterable[Row],
+    right_rows: Iterable[Row],
+    left_key: str,
+    right_key: str,
+) -> Iterator[Tuple[Row, Row]]:
+    left_groups = _key_groups(left_rows, left_key)
+    right_groups = _key_groups(right_rows, right_key)
+    left = next(left_groups, None)
+    right = next(right_groups, None)
+
+    while left is not None and right is not None:
+        try:
+            if left[0] < right[0]:
+                left = next(left_groups, None)
+                continue
+            if right[0] < left[0]:
+                right = next(right_groups, None)
+                continue
+        except TypeError:
+            return
+
+        for left_row in left[1]:
+            for right_row in right[1]:
+                yield left_row, right_row
+        left = next(left_groups, None)
+        right = next(right_groups, None)
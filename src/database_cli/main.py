@@ -1,21 +1,136 @@
 ﻿#!/usr/bin/env python3
+import argparse
+import atexit
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from database_cli.engine import display_welcome, execute_command
-    from database_cli.utils import load_metadata
+    from database_cli import metrics
+    from database_cli.benchmarks import main as run_benchmarks
+    from database_cli.client import DEFAULT_HOST, DEFAULT_PORT
+    from database_cli.decorators import set_auto_confirm
+    from database_cli.engine import display_welcome, execute_command, run_script
+    from database_cli.parallel import configure as configure_parallel_scan
+    from database_cli.server import serve
+    from database_cli.utils import checkpoint, load_metadata, recover_from_wal
 except ImportError as e:
     print(f"Ошибка импорта: {e}")
     sys.exit(1)
 
 
-def main():
-    display_welcome()
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="database",
+        description="Простая реляционная база данных с CLI интерфейсом",
+    )
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=["serve", "bench"],
+        help=(
+            "serve - запустить сервер, принимающий команды по сокету; "
+            "bench - замеры производительности (database bench --help)"
+        ),
+    )
+    parser.add_argument(
+        "-f", "--file",
+        help="выполнить команды из файла (по одной на строку)",
+    )
+    parser.add_argument(
+        "-y", "--yes",
+        action="store_true",
+        help="не запрашивать подтверждение опасных операций",
+    )
+    parser.add_argument(
+        "--socket",
+        help="путь к Unix-сокету для режима serve",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"адрес TCP для режима serve (по умолчанию {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"порт TCP для режима serve (по умолчанию {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="число процессов для параллельного полного просмотра таблиц",
+    )
+    parser.add_argument(
+        "--parallel-threshold",
+        type=int,
+        help="минимальное число строк для параллельного просмотра",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="выгрузить метрики в файл при завершении (.json или Prometheus)",
+    )
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="не собирать метрики",
+    )
+    return parser.parse_args(argv)
+
+
+def _recover() -> int:
+    try:
+        return recover_from_wal()
+    except ValueError as e:
+        print(f"Ошибка восстановления из журнала: {e}")
+        sys.exit(1)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["bench"]:
+        sys.exit(run_benchmarks(argv[1:]))
+
+    args = parse_args(argv)
+    set_auto_confirm(args.yes)
+    configure_parallel_scan(args.workers, args.parallel_threshold)
+    if args.no_metrics:
+        metrics.configure(False)
+    if args.metrics_file:
+        atexit.register(metrics.dump, os.path.abspath(args.metrics_file))
+    if args.mode == "serve":
+        set_auto_confirm(True)
+        os.makedirs("data", exist_ok=True)
+        _recover()
+        serve(args.socket, args.host, args.port)
+        return
+
+    batch_mode = args.file is not None or not sys.stdin.isatty()
+
+    if not batch_mode:
+        display_welcome()
     os.makedirs("data", exist_ok=True)
 
+    replayed = _recover()
+    if replayed:
+        print(f"Восстановлено изменений из журнала: {replayed}")
+
+    if batch_mode:
+        metadata = load_metadata() or {}
+        if args.file is None:
+            run_script(sys.stdin, metadata)
+            return
+
+        try:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                run_script(f, metadata)
+        except OSError as e:
+            print(f"Не удалось прочитать файл '{args.file}': {e}")
+            sys.exit(1)
+        return
+
     metadata = load_metadata()
     if metadata is None:
         print(
@@ -33,16 +148,8 @@ def main():
             if not execute_command(command, metadata):
                 break
 
-            new_metadata = load_metadata()
-            if new_metadata is not None:
-                metadata = new_metadata
-            else:
-                print(
-                    "Предупреждение: метаданные загружены как None, "
-                    "сохраняю предыдущие"
-                )
-
         except KeyboardInterrupt:
+            checkpoint()
             print("\n\nПрограмма завершена.")
             break
         except Exception as e:
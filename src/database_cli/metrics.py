@@ -0,0 +1,166 @@
+import json
+import os
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+METRICS_PREFIX = "database_"
+
+_enabled = os.environ.get("DATABASE_METRICS", "1") != "0"
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+_histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Dict[str, Any]] = {}
+_collectors: List[Callable[[], Dict[str, float]]] = []
+
+
+def configure(enabled: Optional[bool] = None) -> None:
+    global _enabled
+    if enabled is not None:
+        _enabled = enabled
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def increment(name: str, value: float = 1, **labels: str) -> None:
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms[key] = {
+            "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+            "sum": 0.0,
+            "count": 0,
+            "max": 0.0,
+        }
+    histogram["buckets"][bisect_left(LATENCY_BUCKETS, value)] += 1
+    histogram["sum"] += value
+    histogram["count"] += 1
+    if value > histogram["max"]:
+        histogram["max"] = value
+
+
+def register_collector(collector: Callable[[], Dict[str, float]]) -> None:
+    _collectors.append(collector)
+
+
+def reset() -> None:
+    _counters.clear()
+    _histograms.clear()
+
+
+def quantile(histogram: Dict[str, Any], q: float) -> float:
+    rank = q * histogram["count"]
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"], strict=False):
+        seen += count
+        if seen >= rank:
+            return min(bound, histogram["max"])
+    return histogram["max"]
+
+
+def snapshot() -> Dict[str, Any]:
+    gauges: Dict[str, float] = {}
+    for collector in _collectors:
+        gauges.update(collector())
+
+    return {
+        "enabled": _enabled,
+        "counters": [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ],
+        "histograms": [
+            {"name": name, "labels": dict(labels), **histogram}
+            for (name, labels), histogram in sorted(_histograms.items())
+        ],
+        "gauges": gauges,
+    }
+
+
+def counter_totals(name: str, label: Optional[str] = None) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for (counter_name, labels), value in _counters.items():
+        if counter_name != name:
+            continue
+        key = dict(labels).get(label, "") if label else ""
+        totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def _escape_label(value: Any) -> str:
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _labels_text(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())
+    )
+    return "{" + pairs + "}"
+
+
+def to_prometheus(data: Optional[Dict[str, Any]] = None) -> str:
+    data = snapshot() if data is None else data
+    lines = []
+    typed = set()
+
+    for counter in data["counters"]:
+        name = METRICS_PREFIX + counter["name"]
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_labels_text(counter['labels'])} {counter['value']}")
+
+    for histogram in data["histograms"]:
+        name = METRICS_PREFIX + histogram["name"]
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cumulative = 0
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        for bound, count in zip(bounds, histogram["buckets"], strict=True):
+            cumulative += count
+            labels = _labels_text({**histogram["labels"], "le": bound})
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _labels_text(histogram["labels"])
+        lines.append(f"{name}_sum{labels} {histogram['sum']}")
+        lines.append(f"{name}_count{labels} {histogram['count']}")
+
+    for gauge, value in sorted(data["gauges"].items()):
+        name = METRICS_PREFIX + gauge
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: str, fmt: Optional[str] = None) -> str:
+    if fmt is None:
+        fmt = "json" if path.endswith(".json") else "prometheus"
+    if fmt not in ("json", "prometheus"):
+        raise ValueError(
+            f"Неизвестный формат метрик: {fmt}. Доступны: json, prometheus"
+        )
+
+    if fmt == "json":
+        text = json.dumps(snapshot(), ensure_ascii=False, indent=2)
+    else:
+        text = to_prometheus()
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return fmt
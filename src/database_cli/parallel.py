@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .predicates import compile_predicate, equality_values
+    from .rowstore import MappedRows
+    from .schema import get_schema
+except ImportError:
+    from predicates import compile_predicate, equality_values
+    from rowstore import MappedRows
+    from schema import get_schema
+
+SEGMENT_ROWS = 50_000
+SCAN_WORKERS = int(os.environ.get("DATABASE_SCAN_WORKERS", os.cpu_count() or 1))
+PARALLEL_SCAN_THRESHOLD = int(
+    os.environ.get("DATABASE_PARALLEL_THRESHOLD", 200_000)
+)
+
+_shared_rows: Optional[List[Dict[str, Any]]] = None
+
+
+def configure(
+    workers: Optional[int] = None,
+    threshold: Optional[int] = None,
+) -> None:
+    global SCAN_WORKERS, PARALLEL_SCAN_THRESHOLD
+    if workers is not None:
+        SCAN_WORKERS = max(1, workers)
+    if threshold is not None:
+        PARALLEL_SCAN_THRESHOLD = max(0, threshold)
+
+
+def parallel_scan_enabled(rows: int) -> bool:
+    return SCAN_WORKERS >= 2 and rows >= max(PARALLEL_SCAN_THRESHOLD, 1)
+
+
+def _fork_context() -> Optional[multiprocessing.context.BaseContext]:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
+
+
+def _scan_segment(task: Dict[str, Any]) -> List[int]:
+    schema = get_schema(task["table"], task["table_info"])
+    predicate = compile_predicate(task["where"], schema)
+    start, stop = task["start"], task["stop"]
+
+    if "path" in task:
+        view = MappedRows(Path(task["path"]), [])
+        try:
+            values = equality_values(task["where"], schema)
+            return [
+                position
+                for position in view.prefilter(values, start, stop)
+                if predicate(view[position])
+            ]
+        finally:
+            view.close()
+
+    rows = task.get("rows", _shared_rows)
+    offset = task.get("offset", 0)
+    return [
+        position for position in range(start, stop)
+        if predicate(rows[position - offset])
+    ]
+
+
+def _segments(rows: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + SEGMENT_ROWS, rows))
+        for start in range(0, rows, SEGMENT_ROWS)
+    ]
+
+
+def parallel_scan(
+    table_name: str,
+    table_info: Dict[str, Any],
+    data: List[Dict[str, Any]],
+    where: Tuple,
+) -> Optional[List[int]]:
+    global _shared_rows
+
+    if not parallel_scan_enabled(len(data)):
+        return None
+
+    base = {"table": table_name, "table_info": table_info, "where": where}
+    context = _fork_context()
+    tail_start = len(data)
+    tasks = []
+
+    if isinstance(data, MappedRows):
+        tail_start = data.snapshot_rows
+        for start, stop in _segments(tail_start):
+            tasks.append({
+                **base,
+                "path": str(data.path),
+                "start": start,
+                "stop": stop,
+            })
+    elif context is not None:
+        _shared_rows = data
+        for start, stop in _segments(len(data)):
+            tasks.append({**base, "start": start, "stop": stop})
+    else:
+        for start, stop in _segments(len(data)):
+            tasks.append({
+                **base,
+                "rows": data[start:stop],
+                "offset": start,
+                "start": start,
+                "stop": stop,
+            })
+
+    workers = min(SCAN_WORKERS, len(tasks))
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context) as executor:
+            results = list(executor.map(_scan_segment, tasks))
+    finally:
+        _shared_rows = None
+
+    positions = [position for segment in results for position in segment]
+    if tail_start < len(data):
+        predicate = compile_predicate(where, get_schema(table_name, table_info))
+        positions.extend(
+            position for position in range(tail_start, len(data))
+            if predicate(data[position])
+        )
+    return positions
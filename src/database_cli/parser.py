@@ -19,6 +19,17 @@ def parse_create(command: str) -> Tuple[str, List[str]]:
     return table_name, columns
 
 
+def parse_create_index(command: str) -> Tuple[str, str, str]:
+    pattern = r'create\s+(sorted\s+)?index\s+(\w+)\s*\(\s*(\w+)\s*\)'
+    match = re.match(pattern, command, re.IGNORECASE)
+
+    if not match:
+        raise ValueError("Неверный формат команды CREATE INDEX")
+
+    kind = "sorted" if match.group(1) else "hash"
+    return match.group(2), match.group(3), kind
+
+
 def parse_drop(command: str) -> str:
     pattern = r'drop\s+(\w+)'
     match = re.match(pattern, command, re.IGNORECASE)
@@ -29,78 +40,400 @@ def parse_drop(command: str) -> str:
     return match.group(1)
 
 
-def parse_insert(command: str) -> Tuple[str, List[str]]:
-    pattern = r'insert\s+(\w+)\s+values\s*\((.*)\)'
-    match = re.match(pattern, command, re.IGNORECASE)
+def _split_outside_quotes(text: str, separator: str) -> List[str]:
+    parts = []
+    current = []
+    quote = None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == separator:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _search_outside_quotes(pattern: str, text: str) -> Optional[re.Match]:
+    quoted = set()
+    quote = None
+    for position, char in enumerate(text):
+        if quote:
+            quoted.add(position)
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+            quoted.add(position)
+
+    for match in re.finditer(pattern, text, re.IGNORECASE):
+        if match.start() not in quoted:
+            return match
+    return None
+
+
+def _split_value_tuples(values_str: str) -> List[str]:
+    tuples = []
+    depth = 0
+    start = None
+    quote = None
+    for i, char in enumerate(values_str):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == '(':
+            if depth == 0:
+                start = i + 1
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                tuples.append(values_str[start:i])
+            elif depth < 0:
+                raise ValueError("Неверный формат команды INSERT")
+        elif depth == 0 and not char.isspace() and char != ',':
+            raise ValueError("Неверный формат команды INSERT")
+
+    if depth != 0 or quote:
+        raise ValueError("Неверный формат команды INSERT")
+    return tuples
+
+
+def parse_insert(command: str) -> Tuple[str, List[List[str]]]:
+    pattern = r'insert\s+(\w+)\s+values\s*(\(.*\))\s*$'
+    match = re.match(pattern, command, re.IGNORECASE | re.DOTALL)
 
     if not match:
         raise ValueError("Неверный формат команды INSERT")
 
     table_name = match.group(1)
-    values_str = match.group(2).strip()
-    values = [val.strip() for val in values_str.split(',')]
+    rows = [
+        [val.strip() for val in _split_outside_quotes(values_str.strip(), ',')]
+        for values_str in _split_value_tuples(match.group(2))
+    ]
+
+    return table_name, rows
+
+
+def parse_import(command: str) -> Tuple[str, str]:
+    pattern = r'import\s+(\w+)\s+from\s+(.+)'
+    match = re.match(pattern, command, re.IGNORECASE)
+
+    if not match:
+        raise ValueError("Неверный формат команды IMPORT")
 
-    return table_name, values
+    return match.group(1), match.group(2).strip().strip("'\"")
 
 
-def parse_select(command: str) -> Tuple[str, Optional[Dict[str, Any]]]:
-    where_pattern = r'select\s+(\w+)\s+where\s+(.+)=(.+)'
-    match = re.match(where_pattern, command, re.IGNORECASE)
+def _split_limit_clause(
+    command: str,
+) -> Tuple[str, Optional[int], int]:
+    pattern = (
+        r'^(.*?)(?:\s+limit\s+(\d+))?(?:\s+offset\s+(\d+))?\s*$'
+    )
+    match = re.match(pattern, command, re.IGNORECASE | re.DOTALL)
+
+    limit = int(match.group(2)) if match.group(2) is not None else None
+    offset = int(match.group(3)) if match.group(3) is not None else 0
+    return match.group(1), limit, offset
+
+
+def _split_order_clause(command: str) -> Tuple[str, Optional[Tuple[str, bool]]]:
+    pattern = r'^(.*?)\s+order\s+by\s+(\w+)(?:\s+(asc|desc))?\s*$'
+    match = re.match(pattern, command, re.IGNORECASE | re.DOTALL)
+
+    if not match:
+        return command, None
+
+    descending = (match.group(3) or "").lower() == "desc"
+    return match.group(1), (match.group(2), descending)
+
+
+_WHERE_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+        |(?P<op><=|>=|!=|<>|=|<|>)
+        |(?P<punct>[(),])
+        |(?P<word>[^\s(),=<>!'"]+)
+    )""",
+    re.VERBOSE,
+)
+_WHERE_KEYWORDS = ("and", "or", "in", "between")
+
+
+def _tokenize_where(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _WHERE_TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Неверное условие WHERE рядом с: {text[position:]}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            value = value[1:-1]
+        elif kind == "op" and value == "<>":
+            value = "!="
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def parse_where(text: str) -> Tuple:
+    tokens = _tokenize_where(text)
+    position = 0
+
+    def peek_keyword() -> Optional[str]:
+        if position < len(tokens) and tokens[position][0] == "word":
+            word = tokens[position][1].lower()
+            if word in _WHERE_KEYWORDS:
+                return word
+        return None
+
+    def expect(kind: str, value: Optional[str] = None) -> str:
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError("Неожиданный конец условия WHERE")
+        token_kind, token_value = tokens[position]
+        if token_kind != kind or (
+            value is not None and token_value.lower() != value
+        ):
+            raise ValueError(f"Неверное условие WHERE рядом с: {token_value}")
+        position += 1
+        return token_value
+
+    def parse_value() -> str:
+        nonlocal position
+        if position < len(tokens) and tokens[position][0] == "string":
+            position += 1
+            return tokens[position - 1][1]
+
+        words = [expect("word")]
+        while (
+            position < len(tokens)
+            and tokens[position][0] == "word"
+            and peek_keyword() is None
+        ):
+            words.append(tokens[position][1])
+            position += 1
+        return " ".join(words)
+
+    def parse_term() -> Tuple:
+        nonlocal position
+        if position < len(tokens) and tokens[position] == ("punct", "("):
+            position += 1
+            node = parse_or()
+            expect("punct", ")")
+            return node
+
+        column = expect("word")
+        keyword = peek_keyword()
+        if keyword == "in":
+            position += 1
+            expect("punct", "(")
+            values = [parse_value()]
+            while tokens[position:position + 1] == [("punct", ",")]:
+                position += 1
+                values.append(parse_value())
+            expect("punct", ")")
+            return ("in", column, values)
+
+        if keyword == "between":
+            position += 1
+            low = parse_value()
+            expect("word", "and")
+            high = parse_value()
+            return ("between", column, low, high)
+
+        op = expect("op")
+        return (op, column, parse_value())
+
+    def parse_and() -> Tuple:
+        nonlocal position
+        terms = [parse_term()]
+        while peek_keyword() == "and":
+            position += 1
+            terms.append(parse_term())
+        return terms[0] if len(terms) == 1 else ("and", *terms)
+
+    def parse_or() -> Tuple:
+        nonlocal position
+        terms = [parse_and()]
+        while peek_keyword() == "or":
+            position += 1
+            terms.append(parse_and())
+        return terms[0] if len(terms) == 1 else ("or", *terms)
+
+    if not tokens:
+        raise ValueError("Пустое условие WHERE")
+
+    where = parse_or()
+    if position != len(tokens):
+        raise ValueError(
+            f"Неверное условие WHERE рядом с: {tokens[position][1]}"
+        )
+    return where
+
+
+_SELECT_ITEM = r'\w+(?:\s*\(\s*(?:\*|\w+)\s*\))?'
+_AGGREGATE_PATTERN = re.compile(
+    rf'select\s+((?:{_SELECT_ITEM}\s*,\s*)*{_SELECT_ITEM})\s+from\s+(\w+)(.*)$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def is_aggregate_select(command: str) -> bool:
+    match = _AGGREGATE_PATTERN.match(command.strip())
+    return match is not None and "(" in match.group(1)
+
+
+def parse_aggregate(
+    command: str,
+) -> Tuple[str, List[Tuple[str, Optional[str]]], Optional[Tuple], Optional[str]]:
+    match = _AGGREGATE_PATTERN.match(command.strip())
+    if not match:
+        raise ValueError("Неверный формат агрегатного запроса SELECT")
+
+    table_name = match.group(2)
+    rest = match.group(3).strip()
+
+    group_by = None
+    group_match = re.search(r'(?:^|\s)group\s+by\s+(\w+)\s*$', rest, re.IGNORECASE)
+    if group_match:
+        group_by = group_match.group(1)
+        rest = rest[:group_match.start()].strip()
+
+    where = None
+    if rest:
+        where_match = re.match(r'where\s+(.+)$', rest, re.IGNORECASE | re.DOTALL)
+        if not where_match:
+            raise ValueError(f"Неверный формат агрегатного запроса рядом с: {rest}")
+        where = parse_where(where_match.group(1))
+
+    aggregates = []
+    for item in match.group(1).split(","):
+        item = item.strip()
+        call = re.match(r'(\w+)\s*\(\s*(\*|\w+)\s*\)$', item)
+        if call is None:
+            if item != group_by:
+                raise ValueError(
+                    f"Столбец '{item}' должен быть указан в GROUP BY"
+                )
+            continue
+        column = call.group(2)
+        aggregates.append((call.group(1).lower(), None if column == "*" else column))
+
+    if not aggregates:
+        raise ValueError("Агрегатный запрос должен содержать хотя бы одну функцию")
+
+    return table_name, aggregates, where, group_by
+
+
+_JOIN_PATTERN = re.compile(
+    r'select\s+(\w+)\s+join\s+(\w+)\s+on\s+(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)'
+    r'(?:\s+where\s+(.+))?$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def is_join_select(command: str) -> bool:
+    match = re.match(r'select\s+\w+\s+join\s', command.strip(), re.IGNORECASE)
+    return match is not None
+
+
+def parse_join(
+    command: str,
+) -> Tuple[str, str, Tuple[str, str], Optional[Tuple], Optional[int], int]:
+    command, limit, offset = _split_limit_clause(command.strip())
+    match = _JOIN_PATTERN.match(command)
+    if not match:
+        raise ValueError("Неверный формат команды SELECT ... JOIN")
+
+    left_table, right_table = match.group(1), match.group(2)
+    first = (match.group(3), match.group(4))
+    second = (match.group(5), match.group(6))
+    if (first[0], second[0]) == (left_table, right_table):
+        on = (first[1], second[1])
+    elif (first[0], second[0]) == (right_table, left_table):
+        on = (second[1], first[1])
+    else:
+        raise ValueError(
+            f"Условие ON должно связывать таблицы '{left_table}' и '{right_table}'"
+        )
+
+    where = parse_where(match.group(7)) if match.group(7) else None
+    return left_table, right_table, on, where, limit, offset
+
+
+def parse_select(
+    command: str,
+) -> Tuple[str, Optional[Tuple], Optional[Tuple[str, bool]], Optional[int], int]:
+    if _AGGREGATE_PATTERN.match(command.strip()):
+        raise ValueError(
+            "Выборка отдельных столбцов не поддерживается. "
+            "Используйте: select <таблица> [where <условие>]"
+        )
+
+    command, limit, offset = _split_limit_clause(command)
+    command, order_by = _split_order_clause(command)
+
+    where_pattern = r'select\s+(\w+)\s+where\s+(.+)'
+    match = re.match(where_pattern, command, re.IGNORECASE | re.DOTALL)
 
     if match:
         table_name = match.group(1).strip()
-        column = match.group(2).strip()
-        value = match.group(3).strip()
-        return table_name, {column: value}
+        return table_name, parse_where(match.group(2)), order_by, limit, offset
     else:
-        pattern = r'select\s+(\w+)'
+        pattern = r'select\s+(\w+)\s*$'
         match = re.match(pattern, command, re.IGNORECASE)
 
         if not match:
             raise ValueError("Неверный формат команды SELECT")
 
-        return match.group(1), None
+        return match.group(1), None, order_by, limit, offset
 
 
-def parse_update(command: str) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
-    pattern = r'update\s+(\w+)\s+set\s+(.+)\s+where\s+(.+)=(.+)'
-    match = re.match(pattern, command, re.IGNORECASE)
+def parse_update(command: str) -> Tuple[str, Dict[str, Any], Tuple]:
+    pattern = r'update\s+(\w+)\s+set\s+(.+)'
+    match = re.match(pattern, command, re.IGNORECASE | re.DOTALL)
+    where = _search_outside_quotes(r'\s+where\s+', match.group(2)) if match else None
 
-    if not match:
+    if where is None:
         raise ValueError(
             "Неверный формат условия WHERE. "
             "Используйте: where <столбец> = <значение>"
         )
 
     table_name = match.group(1).strip()
-    set_clause_str = match.group(2).strip()
-    where_column = match.group(3).strip()
-    where_value = match.group(4).strip()
+    set_clause_str = match.group(2)[:where.start()].strip()
 
     set_clause = {}
-    set_parts = set_clause_str.split(',')
+    set_parts = _split_outside_quotes(set_clause_str, ',')
     for part in set_parts:
-        key_value = part.split('=')
+        key_value = part.split('=', 1)
         if len(key_value) == 2:
             set_clause[key_value[0].strip()] = key_value[1].strip()
 
-    where_clause = {where_column: where_value}
-
-    return table_name, set_clause, where_clause
+    return table_name, set_clause, parse_where(match.group(2)[where.end():])
 
 
-def parse_delete(command: str) -> Tuple[str, Dict[str, Any]]:
-    pattern = r'delete\s+(\w+)\s+where\s+(.+)=(.+)'
-    match = re.match(pattern, command, re.IGNORECASE)
+def parse_delete(command: str) -> Tuple[str, Tuple]:
+    pattern = r'delete\s+(\w+)\s+where\s+(.+)'
+    match = re.match(pattern, command, re.IGNORECASE | re.DOTALL)
 
     if not match:
         raise ValueError("Неверный формат команды DELETE")
 
     table_name = match.group(1).strip()
-    column = match.group(2).strip()
-    value = match.group(3).strip()
-
-    return table_name, {column: value}
+    return table_name, parse_where(match.group(2))
 
 
 def parse_info(command: str) -> str:
@@ -111,12 +444,58 @@ def parse_info(command: str) -> str:
         raise ValueError("Неверный формат команды INFO")
 
     return match.group(1)
+
+
+def parse_explain(command: str) -> Tuple[bool, str]:
+    pattern = r'explain\s+(?:(analyze)\s+)?(.+)$'
+    match = re.match(pattern, command.strip(), re.IGNORECASE | re.DOTALL)
+    if not match:
+        raise ValueError("Неверный формат команды EXPLAIN")
+
+    return match.group(1) is not None, match.group(2).strip()
+
+
+def parse_stats(command: str) -> Tuple[str, Optional[str], Optional[str]]:
+    pattern = (
+        r'stats(?:\s+(reset|on|off|dump)'
+        r'(?:\s+(\S+)(?:\s+(json|prometheus))?)?)?\s*$'
+    )
+    match = re.match(pattern, command.strip(), re.IGNORECASE)
+    if not match:
+        raise ValueError("Неверный формат команды STATS")
+
+    action = (match.group(1) or "show").lower()
+    path = match.group(2)
+    if action == "dump" and path is None:
+        raise ValueError("Укажите файл: stats dump <файл> [json|prometheus]")
+    if action != "dump" and path is not None:
+        raise ValueError("Неверный формат команды STATS")
+
+    fmt = match.group(3).lower() if match.group(3) else None
+    return action, path, fmt
+
+
+def parse_storage(command: str) -> Tuple[str, str]:
+    pattern = r'storage\s+(\w+)\s+(\w+)'
+    match = re.match(pattern, command, re.IGNORECASE)
+
+    if not match:
+        raise ValueError("Неверный формат команды STORAGE")
+
+    return match.group(1), match.group(2).lower()
+
+
 COMMAND_PARSERS = {
     'create': parse_create,
+    'create index': parse_create_index,
     'drop': parse_drop,
     'insert': parse_insert,
+    'import': parse_import,
     'select': parse_select,
     'update': parse_update,
     'delete': parse_delete,
     'info': parse_info,
+    'explain': parse_explain,
+    'stats': parse_stats,
+    'storage': parse_storage,
 }
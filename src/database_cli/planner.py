@@ -0,0 +1,117 @@
+import time
+from collections.abc import Iterator
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_EQUALITY_SELECTIVITY = 0.005
+DEFAULT_RANGE_SELECTIVITY = 1 / 3
+
+ACCESS_PATHS = {
+    "cache": "готовый результат из кэша запросов",
+    "row_count": "число строк из статистики таблицы",
+    "columnar": "просмотр столбцов",
+    "columnar_zone": "просмотр столбцов в блоках, отобранных зональными картами",
+    "index_order": "обход упорядоченного индекса",
+    "index_lookup": "поиск по индексу",
+    "index_range": "диапазон упорядоченного индекса",
+    "zone_map": "просмотр блоков, отобранных зональными картами",
+    "parallel": "параллельный полный просмотр",
+    "prefilter": "полный просмотр с поиском значений в файле",
+    "full_scan": "полный просмотр",
+}
+
+Stage = Callable[[str, Callable[[], Any]], Any]
+
+
+def lazy_stage(name: str, make: Callable[[], Any]) -> Any:
+    return make()
+
+
+def stage_timer(stages: List[List[Any]]) -> Stage:
+    nested = [0.0]
+
+    def stage(name: str, make: Callable[[], Any]) -> Any:
+        entry = next((item for item in stages if item[0] == name), None)
+        if entry is None:
+            entry = [name, 0.0]
+            stages.append(entry)
+
+        outer, nested[0] = nested[0], 0.0
+        start = time.perf_counter()
+        try:
+            result = make()
+            if isinstance(result, Iterator):
+                result = list(result)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            entry[1] += elapsed - nested[0]
+            nested[0] = outer + elapsed
+
+    return stage
+
+
+def format_where(node: Optional[Tuple]) -> str:
+    if node is None:
+        return ""
+    op = node[0]
+    if op in ("and", "or"):
+        parts = []
+        for child in node[1:]:
+            text = format_where(child)
+            if op == "and" and child[0] == "or":
+                text = f"({text})"
+            parts.append(text)
+        return f" {op} ".join(parts)
+    if op == "in":
+        return f"{node[1]} in ({', '.join(str(value) for value in node[2])})"
+    if op == "between":
+        return f"{node[1]} between {node[2]} and {node[3]}"
+    return f"{node[1]} {op} {node[2]}"
+
+
+def where_terms(where: Optional[Tuple]) -> List[Tuple]:
+    if where is None:
+        return []
+    return list(where[1:]) if where[0] == "and" else [where]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def estimate_lookup(
+    summary: Optional[Dict[str, Dict[str, Any]]],
+    rows: int,
+    lookups: List[Tuple[str, Any]],
+) -> int:
+    total = 0.0
+    for column, _ in lookups:
+        distinct = (summary or {}).get(column, {}).get("distinct")
+        if distinct:
+            total += rows / distinct
+        else:
+            total += max(1, rows * DEFAULT_EQUALITY_SELECTIVITY)
+    return min(rows, round(total))
+
+
+def estimate_range(
+    summary: Optional[Dict[str, Dict[str, Any]]],
+    rows: int,
+    bounds: Tuple[str, Any, Any, bool, bool],
+) -> int:
+    column, low, high = bounds[:3]
+    column_stats = (summary or {}).get(column, {})
+    lowest, highest = column_stats.get("min"), column_stats.get("max")
+
+    if not all(_is_number(value) for value in (lowest, highest)) or not all(
+        value is None or _is_number(value) for value in (low, high)
+    ):
+        return round(rows * DEFAULT_RANGE_SELECTIVITY)
+
+    start = lowest if low is None else max(low, lowest)
+    stop = highest if high is None else min(high, highest)
+    if start > stop:
+        return 0
+    if highest == lowest:
+        return rows
+    return max(1, round(rows * (stop - start) / (highest - lowest)))
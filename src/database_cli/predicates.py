@@ -0,0 +1,316 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+_COMPARATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def normalize_where(where_clause: Any) -> Optional[Tuple]:
+    if not where_clause:
+        return None
+    if isinstance(where_clause, tuple):
+        return where_clause
+
+    terms = [("=", column, value) for column, value in where_clause.items()]
+    if len(terms) == 1:
+        return terms[0]
+    return ("and", *terms)
+
+
+def where_columns(where: Optional[Tuple]) -> Set[str]:
+    if where is None:
+        return set()
+    if where[0] in ("and", "or"):
+        columns = set()
+        for child in where[1:]:
+            columns |= where_columns(child)
+        return columns
+    return {where[1]}
+
+
+def _typed(schema: Dict[str, Any], column: str, value: Any) -> Any:
+    converter = schema["converters"].get(column)
+    if converter is None or not isinstance(value, str):
+        return value
+
+    try:
+        return converter(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(
+            f"Значение '{value}' не подходит для столбца '{column}': {e}"
+        ) from e
+
+
+def _compile_value_test(
+    node: Tuple,
+    schema: Dict[str, Any],
+) -> Callable[[Any], bool]:
+    op, column = node[0], node[1]
+
+    if column not in schema["converters"]:
+        if op == "in":
+            expected_set = {str(value) for value in node[2]}
+            return lambda value: str(value) in expected_set
+        if op == "=":
+            expected = str(node[2])
+            return lambda value: str(value) == expected
+        if op == "!=":
+            expected = str(node[2])
+            return lambda value: str(value) != expected
+
+    if op == "=":
+        expected = _typed(schema, column, node[2])
+        return lambda value: value == expected
+
+    if op == "in":
+        expected_set = {_typed(schema, column, value) for value in node[2]}
+        return lambda value: value in expected_set
+
+    if op == "between":
+        low = _typed(schema, column, node[2])
+        high = _typed(schema, column, node[3])
+
+        def between(value: Any) -> bool:
+            try:
+                return low <= value <= high
+            except TypeError:
+                return False
+
+        return between
+
+    compare = _COMPARATORS[op]
+    expected = _typed(schema, column, node[2])
+
+    def test(value: Any) -> bool:
+        try:
+            return compare(value, expected)
+        except TypeError:
+            return False
+
+    return test
+
+
+def compile_predicate(
+    where: Optional[Tuple],
+    schema: Dict[str, Any],
+) -> Callable[[Dict[str, Any]], bool]:
+    if where is None:
+        return lambda record: True
+
+    op = where[0]
+    if op == "and":
+        predicates = [compile_predicate(child, schema) for child in where[1:]]
+        return lambda record: all(p(record) for p in predicates)
+
+    if op == "or":
+        predicates = [compile_predicate(child, schema) for child in where[1:]]
+        return lambda record: any(p(record) for p in predicates)
+
+    column = where[1]
+    test = _compile_value_test(where, schema)
+    default = "" if column not in schema["converters"] else None
+    return lambda record: test(record.get(column, default))
+
+
+def evaluate_columns(
+    where: Tuple,
+    schema: Dict[str, Any],
+    columns: Dict[str, List[Any]],
+) -> List[bool]:
+    op = where[0]
+    if op in ("and", "or"):
+        masks = [evaluate_columns(child, schema, columns) for child in where[1:]]
+        combine = all if op == "and" else any
+        return [combine(bits) for bits in zip(*masks, strict=True)]
+
+    test = _compile_value_test(where, schema)
+    return [test(value) for value in columns[where[1]]]
+
+
+def index_lookups(
+    where: Optional[Tuple],
+    indexed: Dict[str, str],
+    schema: Dict[str, Any],
+) -> Optional[List[Tuple[str, Any]]]:
+    if where is None:
+        return None
+
+    op = where[0]
+    if op == "and":
+        for child in where[1:]:
+            lookups = index_lookups(child, indexed, schema)
+            if lookups is not None:
+                return lookups
+        return None
+
+    if op == "or":
+        lookups = []
+        for child in where[1:]:
+            child_lookups = index_lookups(child, indexed, schema)
+            if child_lookups is None:
+                return None
+            lookups.extend(child_lookups)
+        return lookups
+
+    column = where[1]
+    if column not in indexed:
+        return None
+    if op == "=":
+        return [(column, _typed(schema, column, where[2]))]
+    if op == "in":
+        return [(column, _typed(schema, column, value)) for value in where[2]]
+    return None
+
+
+def _node_bounds(
+    node: Tuple,
+    schema: Dict[str, Any],
+) -> Optional[Tuple[Any, Any, bool, bool]]:
+    op, column = node[0], node[1]
+    if op == "between":
+        low = _typed(schema, column, node[2])
+        high = _typed(schema, column, node[3])
+        return low, high, True, True
+
+    if op not in ("=", "<", "<=", ">", ">="):
+        return None
+
+    value = _typed(schema, column, node[2])
+    if op == "=":
+        return value, value, True, True
+    if op in (">", ">="):
+        return value, None, op == ">=", True
+    return None, value, True, op == "<="
+
+
+def range_bounds(
+    where: Optional[Tuple],
+    sorted_columns: List[str],
+    schema: Dict[str, Any],
+) -> Optional[Tuple[str, Any, Any, bool, bool]]:
+    if where is None or where[0] == "or":
+        return None
+
+    terms = where[1:] if where[0] == "and" else (where,)
+    for column in sorted_columns:
+        low, high, low_inclusive, high_inclusive = None, None, True, True
+        found = False
+        for term in terms:
+            if term[0] in ("and", "or") or term[1] != column:
+                continue
+            bounds = _node_bounds(term, schema)
+            if bounds is None:
+                continue
+
+            found = True
+            term_low, term_high, term_low_inc, term_high_inc = bounds
+            try:
+                if term_low is not None and (
+                    low is None or term_low > low
+                    or (term_low == low and not term_low_inc)
+                ):
+                    low, low_inclusive = term_low, term_low_inc
+                if term_high is not None and (
+                    high is None or term_high < high
+                    or (term_high == high and not term_high_inc)
+                ):
+                    high, high_inclusive = term_high, term_high_inc
+            except TypeError:
+                return None
+
+        if found:
+            return column, low, high, low_inclusive, high_inclusive
+    return None
+
+
+def equality_values(where: Optional[Tuple], schema: Dict[str, Any]) -> List[Any]:
+    if where is None:
+        return []
+    if where[0] == "and":
+        values = []
+        for child in where[1:]:
+            values.extend(equality_values(child, schema))
+        return values
+    if where[0] == "=":
+        return [_typed(schema, where[1], where[2])]
+    return []
+
+
+def value_family(value: Any) -> Optional[str]:
+    if isinstance(value, (bool, int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "str"
+    return None
+
+
+def _zone_value_test(
+    node: Tuple,
+    schema: Dict[str, Any],
+    zone: Dict[str, Any],
+) -> bool:
+    op = node[0]
+    family, low, high = zone["family"], zone["min"], zone["max"]
+
+    if op == "!=":
+        if zone["nulls"] or family not in ("number", "str"):
+            return True
+        expected = _typed(schema, node[1], node[2])
+        return not (low == high == expected and value_family(expected) == family)
+
+    if op == "in":
+        values = [_typed(schema, node[1], value) for value in node[2]]
+    elif op == "between":
+        values = [
+            _typed(schema, node[1], node[2]),
+            _typed(schema, node[1], node[3]),
+        ]
+    else:
+        values = [_typed(schema, node[1], node[2])]
+
+    if family == "mixed":
+        return True
+    values = [value for value in values if value_family(value) == family]
+    if family is None or not values:
+        return False
+
+    if op in ("=", "in"):
+        return any(low <= value <= high for value in values)
+    if op == "between":
+        return len(values) == 2 and values[0] <= high and values[1] >= low
+    if op == ">":
+        return high > values[0]
+    if op == ">=":
+        return high >= values[0]
+    if op == "<":
+        return low < values[0]
+    return low <= values[0]
+
+
+def zone_may_match(
+    where: Optional[Tuple],
+    schema: Dict[str, Any],
+    zones: Dict[str, Dict[str, Any]],
+) -> bool:
+    if where is None:
+        return True
+
+    op = where[0]
+    if op == "and":
+        return all(zone_may_match(child, schema, zones) for child in where[1:])
+    if op == "or":
+        return any(zone_may_match(child, schema, zones) for child in where[1:])
+
+    zone = zones.get(where[1])
+    if zone is None or where[1] not in schema["converters"]:
+        return True
+    try:
+        return _zone_value_test(where, schema, zone)
+    except TypeError:
+        return True
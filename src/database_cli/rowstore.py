@@ -0,0 +1,130 @@
+import json
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+_OFFSET_CODE = "Q"
+
+
+def offsets_file(path: Path) -> Path:
+    return path.parent / f"{path.name}.idx"
+
+
+def write_table(path: Path, data: List[Dict[str, Any]]) -> None:
+    offsets = array(_OFFSET_CODE)
+    position = 0
+    with open(path, 'wb') as f:
+        for record in data:
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode()
+            offsets.append(position)
+            f.write(line)
+            position += len(line)
+    offsets.append(position)
+
+    with open(offsets_file(path), 'wb') as f:
+        offsets.tofile(f)
+
+
+def _needle(value: Any) -> Optional[bytes]:
+    text = str(value)
+    if not text or text in ("True", "False", "None"):
+        return None
+    if any(char in text for char in '"\\') or any(ord(c) < 0x20 for c in text):
+        return None
+    return text.encode()
+
+
+class MappedRows:
+    def __init__(self, path: Path, tail: List[Dict[str, Any]]):
+        self.path = path
+        self._tail = tail
+        self._files = []
+        self._maps = []
+        self._data: Optional[mmap.mmap] = None
+        self._offsets: Optional[memoryview] = None
+        self.bytes_read = 0
+
+        data_map = self._map_file(path)
+        offsets_map = self._map_file(offsets_file(path))
+        if data_map is not None and offsets_map is not None:
+            self._data = data_map
+            self._offsets = memoryview(offsets_map).cast(_OFFSET_CODE)
+
+        self._rows = len(self._offsets) - 1 if self._offsets is not None else 0
+
+    def _map_file(self, path: Path) -> Optional[mmap.mmap]:
+        if not path.exists():
+            return None
+
+        f = open(path, 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    @property
+    def snapshot_rows(self) -> int:
+        return self._rows
+
+    def __len__(self) -> int:
+        return self._rows + len(self._tail)
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        if position < 0:
+            position += len(self)
+        if position >= self._rows:
+            return self._tail[position - self._rows]
+
+        start = self._offsets[position]
+        end = self._offsets[position + 1]
+        self.bytes_read += end - start
+        return json.loads(self._data[start:end])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def prefilter(
+        self,
+        values: List[Any],
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Iterator[int]:
+        needles = [_needle(value) for value in values]
+        needles = [needle for needle in needles if needle]
+        stop = len(self) if stop is None else stop
+
+        for position in range(start, min(stop, self._rows)):
+            if needles:
+                begin = self._offsets[position]
+                end = self._offsets[position + 1]
+                self.bytes_read += end - begin
+                if any(self._data.find(n, begin, end) == -1 for n in needles):
+                    continue
+            yield position
+
+        yield from range(max(start, self._rows), stop)
+
+    def close(self) -> None:
+        if self._offsets is not None:
+            self._offsets.release()
+            self._offsets = None
+        for mapped in self._maps:
+            mapped.close()
+        for f in self._files:
+            f.close()
+        self._maps = []
+        self._files = []
+
+
+def read_rows(path: Path) -> List[Dict[str, Any]]:
+    rows = MappedRows(path, [])
+    try:
+        return list(rows)
+    finally:
+        rows.close()
@@ -0,0 +1,77 @@
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from .utils import get_converter
+except ImportError:
+    from utils import get_converter
+
+_schema_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def parse_column_def(col_def: str) -> Tuple[str, str]:
+    parts = col_def.split(" ")
+    if len(parts) == 1:
+        return parts[0], "str"
+    return " ".join(parts[:-1]), parts[-1]
+
+
+def get_schema(table_name: str, table_info: Any) -> Dict[str, Any]:
+    if not isinstance(table_info, dict):
+        raise ValueError(f"Метаданные таблицы '{table_name}' повреждены")
+
+    if "columns" not in table_info:
+        raise ValueError(
+            f"Таблица '{table_name}' не содержит определения столбцов"
+        )
+
+    columns_list = table_info["columns"]
+    if not isinstance(columns_list, list):
+        raise ValueError(
+            f"Определение столбцов в таблице '{table_name}' "
+            "должно быть списком"
+        )
+
+    signature = (tuple(columns_list), table_info.get("primary_key"))
+    cached = _schema_cache.get(table_name)
+    if cached is not None and cached["signature"] == signature:
+        return cached
+
+    for col_def in columns_list:
+        if not isinstance(col_def, str):
+            raise ValueError(
+                f"Определение столбца должно быть строкой, "
+                f"получено: {type(col_def)}"
+            )
+
+    columns = [parse_column_def(col_def) for col_def in columns_list]
+    names = [name for name, _ in columns]
+    primary_key = table_info.get("primary_key") or (
+        "ID" if "ID" in names else None
+    )
+    converters = {name: get_converter(col_type) for name, col_type in columns}
+
+    schema = {
+        "signature": signature,
+        "columns": columns,
+        "names": names,
+        "positions": {name: i for i, name in enumerate(names)},
+        "types": dict(columns),
+        "converters": converters,
+        "primary_key": primary_key,
+        "insert_columns": [
+            (name, col_type, converters[name]) for name, col_type in columns
+        ],
+        "auto_insert_columns": [
+            (name, col_type, converters[name]) for name, col_type in columns
+            if name != primary_key
+        ],
+    }
+    _schema_cache[table_name] = schema
+    return schema
+
+
+def invalidate_schema(table_name: Optional[str] = None) -> None:
+    if table_name is None:
+        _schema_cache.clear()
+    else:
+        _schema_cache.pop(table_name, None)
@@ -0,0 +1,148 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+try:
+    from .client import DEFAULT_HOST, DEFAULT_PORT
+    from .engine import execute_command
+    from .utils import checkpoint, in_transaction, load_metadata, load_table_data
+except ImportError:
+    from client import DEFAULT_HOST, DEFAULT_PORT
+    from engine import execute_command
+    from utils import checkpoint, in_transaction, load_metadata, load_table_data
+
+
+def _run_command(
+    state: Dict[str, Any],
+    connection: object,
+    command: str,
+) -> Dict[str, Any]:
+    if command.strip().lower() == "exit":
+        return {"ok": True, "output": "", "closed": True}
+
+    if state["owner"] not in (None, connection):
+        return {
+            "ok": False,
+            "output": "Выполняется транзакция другого клиента, повторите позже.",
+        }
+
+    buffer = io.StringIO()
+    error = None
+    try:
+        with contextlib.redirect_stdout(buffer):
+            execute_command(command, state["metadata"])
+    except Exception as e:
+        error = f"Ошибка выполнения команды: {e}"
+    state["owner"] = connection if in_transaction() else None
+    response = {
+        "ok": error is None,
+        "output": buffer.getvalue(),
+        "transaction": state["owner"] is connection,
+    }
+    if error is not None:
+        response["error"] = error
+    return response
+
+
+async def _execute(
+    state: Dict[str, Any],
+    connection: object,
+    command: str,
+) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        state["executor"], _run_command, state, connection, command
+    )
+
+
+async def _handle_client(
+    state: Dict[str, Any],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    connection = object()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            try:
+                command = json.loads(line)["command"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                response = {"ok": False, "output": "Неверный формат запроса."}
+            else:
+                response = await _execute(state, connection, command)
+
+            payload = json.dumps(response, ensure_ascii=False) + "\n"
+            writer.write(payload.encode())
+            await writer.drain()
+            if response.get("closed"):
+                break
+    except ConnectionError:
+        pass
+    finally:
+        if state["owner"] is connection:
+            await _execute(state, connection, "rollback")
+        writer.close()
+
+
+def _warm_up(metadata: Dict[str, Any]) -> None:
+    for table_name in metadata:
+        load_table_data(table_name)
+
+
+async def _serve(
+    socket_path: Optional[str],
+    host: str,
+    port: int,
+) -> None:
+    metadata = load_metadata()
+    _warm_up(metadata)
+    state = {
+        "metadata": metadata,
+        "owner": None,
+        "executor": ThreadPoolExecutor(max_workers=1),
+    }
+
+    async def handler(reader, writer):
+        await _handle_client(state, reader, writer)
+
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(handler, path=socket_path)
+        address = socket_path
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        address = f"{host}:{port}"
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    print(f"Сервер базы данных слушает {address}")
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        state["executor"].shutdown(wait=True)
+        checkpoint()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+        print("Сервер остановлен.")
+
+
+def serve(
+    socket_path: Optional[str] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> None:
+    asyncio.run(_serve(socket_path, host, port))
@@ -0,0 +1,326 @@
+import json
+import zlib
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from .predicates import value_family, zone_may_match
+    from .utils import (
+        get_table_files_stamp,
+        in_transaction,
+        register_checkpoint_hook,
+        write_file_atomic,
+    )
+except ImportError:
+    from predicates import value_family, zone_may_match
+    from utils import (
+        get_table_files_stamp,
+        in_transaction,
+        register_checkpoint_hook,
+        write_file_atomic,
+    )
+
+STATS_CHUNK_ROWS = 8192
+SKETCH_SIZE = 32
+_HASH_SPACE = 2 ** 32
+
+_stats_cache: Dict[str, Dict[str, Any]] = {}
+_dirty_tables: Set[str] = set()
+
+
+def _stats_file(table_name: str) -> Path:
+    return Path("data") / f"{table_name}.stats.json"
+
+
+def _files_stamp(table_name: str) -> List[Optional[List[int]]]:
+    return [
+        list(part) if part else None
+        for part in get_table_files_stamp(table_name)
+    ]
+
+
+def _new_zone() -> Dict[str, Any]:
+    return {"family": None, "min": None, "max": None, "nulls": 0, "sketch": []}
+
+
+def _zone_add(zone: Dict[str, Any], value: Any) -> None:
+    if value is None:
+        zone["nulls"] += 1
+        return
+
+    family = value_family(value) or "mixed"
+    if zone["family"] is None:
+        zone["family"] = family
+        if family != "mixed":
+            zone["min"] = zone["max"] = value
+    elif zone["family"] != family:
+        zone.update(family="mixed", min=None, max=None)
+    elif family != "mixed":
+        if value < zone["min"]:
+            zone["min"] = value
+        elif value > zone["max"]:
+            zone["max"] = value
+
+    sketch = zone["sketch"]
+    hashed = zlib.crc32(str(value).encode())
+    if len(sketch) == SKETCH_SIZE and hashed >= sketch[-1]:
+        return
+    slot = bisect_left(sketch, hashed)
+    if slot < len(sketch) and sketch[slot] == hashed:
+        return
+    sketch.insert(slot, hashed)
+    if len(sketch) > SKETCH_SIZE:
+        sketch.pop()
+
+
+def _new_chunk(columns: List[str]) -> Dict[str, Any]:
+    return {"rows": 0, "zones": {name: _new_zone() for name in columns}}
+
+
+def _chunk_add(chunk: Dict[str, Any], record: Dict[str, Any]) -> None:
+    for name, zone in chunk["zones"].items():
+        _zone_add(zone, record.get(name))
+    chunk["rows"] += 1
+
+
+def _add_rows(stats: Dict[str, Any], records: Iterable[Dict[str, Any]]) -> None:
+    chunks = stats["chunks"]
+    for record in records:
+        if not chunks or chunks[-1]["rows"] >= STATS_CHUNK_ROWS:
+            chunks.append(_new_chunk(stats["columns"]))
+        _chunk_add(chunks[-1], record)
+        stats["rows"] += 1
+
+
+def _rows_from(data: Any, start: int, stop: Optional[int] = None) -> Iterator[Any]:
+    stop = len(data) if stop is None else min(stop, len(data))
+    return (data[position] for position in range(start, stop))
+
+
+def build_table_stats(
+    table_name: str,
+    columns: List[str],
+    data: Any,
+) -> Dict[str, Any]:
+    stats = {"columns": list(columns), "rows": 0, "chunks": []}
+    _add_rows(stats, _rows_from(data, 0))
+    stats["files"] = _files_stamp(table_name)
+
+    _stats_cache[table_name] = stats
+    _dirty_tables.add(table_name)
+    return stats
+
+
+def save_table_stats(table_name: str) -> None:
+    stats = _stats_cache.get(table_name)
+    _dirty_tables.discard(table_name)
+    if stats is None or in_transaction():
+        return
+
+    data_dir = Path("data")
+    data_dir.mkdir(exist_ok=True)
+    write_file_atomic(_stats_file(table_name), json.dumps(stats, ensure_ascii=False))
+
+
+def flush_table_stats() -> None:
+    for table_name in list(_dirty_tables):
+        save_table_stats(table_name)
+
+
+register_checkpoint_hook(flush_table_stats)
+
+
+def _read_stats(table_name: str) -> Optional[Dict[str, Any]]:
+    stats_file = _stats_file(table_name)
+    if not stats_file.exists():
+        return None
+    try:
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def _fresh_stats(
+    table_name: str,
+    files: List[Optional[List[int]]],
+) -> Optional[Dict[str, Any]]:
+    stats = _stats_cache.get(table_name)
+    if stats is not None and stats.get("files") == files:
+        return stats
+
+    stored = _read_stats(table_name)
+    if stored is not None and stored.get("files") == files:
+        _stats_cache[table_name] = stored
+        return stored
+    return None
+
+
+def load_table_stats(
+    table_name: str,
+    columns: List[str],
+    load_rows: Callable[[], Any],
+) -> Optional[Dict[str, Any]]:
+    if in_transaction():
+        return None
+
+    files = _files_stamp(table_name)
+    stats = _fresh_stats(table_name, files)
+    if stats is not None and stats["columns"] == columns:
+        return stats
+
+    stats = _stats_cache.get(table_name) or _read_stats(table_name)
+    data = load_rows()
+    if (
+        stats is None
+        or stats["columns"] != columns
+        or stats["files"][0] != files[0]
+        or stats["rows"] > len(data)
+    ):
+        return build_table_stats(table_name, columns, data)
+
+    _add_rows(stats, _rows_from(data, stats["rows"]))
+    stats["files"] = files
+    _stats_cache[table_name] = stats
+    _dirty_tables.add(table_name)
+    return stats
+
+
+def fresh_table_stats(
+    table_name: str,
+    columns: List[str],
+) -> Optional[Dict[str, Any]]:
+    if in_transaction():
+        return None
+    stats = _fresh_stats(table_name, _files_stamp(table_name))
+    if stats is None or stats["columns"] != columns:
+        return None
+    return stats
+
+
+def stats_row_count(table_name: str) -> Optional[int]:
+    if in_transaction():
+        return None
+    stats = _fresh_stats(table_name, _files_stamp(table_name))
+    return None if stats is None else stats["rows"]
+
+
+def _current_stats(table_name: str, rows: int) -> Optional[Dict[str, Any]]:
+    stats = _stats_cache.get(table_name)
+    if stats is None or in_transaction() or stats["rows"] != rows:
+        _stats_cache.pop(table_name, None)
+        _dirty_tables.discard(table_name)
+        return None
+    return stats
+
+
+def stats_insert(
+    table_name: str,
+    records: List[Dict[str, Any]],
+    position: int,
+) -> None:
+    stats = _current_stats(table_name, position)
+    if stats is None:
+        return
+
+    _add_rows(stats, records)
+    stats["files"] = _files_stamp(table_name)
+    _dirty_tables.add(table_name)
+
+
+def stats_update(
+    table_name: str,
+    data: List[Dict[str, Any]],
+    positions: List[int],
+) -> None:
+    stats = _current_stats(table_name, len(data))
+    if stats is None:
+        return
+
+    for number in {position // STATS_CHUNK_ROWS for position in positions}:
+        start = number * STATS_CHUNK_ROWS
+        chunk = _new_chunk(stats["columns"])
+        for record in _rows_from(data, start, start + STATS_CHUNK_ROWS):
+            _chunk_add(chunk, record)
+        stats["chunks"][number] = chunk
+
+    stats["files"] = _files_stamp(table_name)
+    _dirty_tables.add(table_name)
+
+
+def stats_delete(
+    table_name: str,
+    data: List[Dict[str, Any]],
+    deleted_positions: List[int],
+    rows_before: int,
+) -> None:
+    stats = _current_stats(table_name, rows_before)
+    if stats is None:
+        return
+
+    first = min(deleted_positions) // STATS_CHUNK_ROWS
+    del stats["chunks"][first:]
+    stats["rows"] = first * STATS_CHUNK_ROWS
+    _add_rows(stats, _rows_from(data, stats["rows"]))
+
+    stats["files"] = _files_stamp(table_name)
+    _dirty_tables.add(table_name)
+
+
+def drop_table_stats(table_name: str) -> None:
+    _stats_cache.pop(table_name, None)
+    _dirty_tables.discard(table_name)
+    stats_file = _stats_file(table_name)
+    if stats_file.exists():
+        stats_file.unlink()
+
+
+def matching_ranges(
+    stats: Dict[str, Any],
+    where: Optional[Tuple],
+    schema: Dict[str, Any],
+) -> Optional[List[Tuple[int, int]]]:
+    ranges: List[Tuple[int, int]] = []
+    skipped = False
+    start = 0
+    for chunk in stats["chunks"]:
+        stop = start + chunk["rows"]
+        if not zone_may_match(where, schema, chunk["zones"]):
+            skipped = True
+        elif ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], stop)
+        else:
+            ranges.append((start, stop))
+        start = stop
+    return ranges if skipped else None
+
+
+def _estimate_distinct(sketches: List[List[int]], present: int) -> int:
+    merged = sorted(set().union(*sketches))[:SKETCH_SIZE]
+    if len(merged) < SKETCH_SIZE:
+        return len(merged)
+    estimate = (SKETCH_SIZE - 1) * _HASH_SPACE / (merged[-1] + 1)
+    return min(round(estimate), present)
+
+
+def summarize_stats(stats: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    summary = {}
+    for name in stats["columns"]:
+        zones = [chunk["zones"][name] for chunk in stats["chunks"]]
+        families = {zone["family"] for zone in zones if zone["family"]}
+        low = high = None
+        if len(families) == 1 and "mixed" not in families:
+            low = min(zone["min"] for zone in zones if zone["family"])
+            high = max(zone["max"] for zone in zones if zone["family"])
+
+        nulls = sum(zone["nulls"] for zone in zones)
+        summary[name] = {
+            "min": low,
+            "max": high,
+            "nulls": nulls,
+            "distinct": _estimate_distinct(
+                [zone["sketch"] for zone in zones], stats["rows"] - nulls
+            ),
+        }
+    return summary
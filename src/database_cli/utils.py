@@ -1,74 +1,809 @@
+import copy
 import json
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from . import columnar, metrics, rowstore, wal
+except ImportError:
+    import columnar
+    import metrics
+    import rowstore
+    import wal
+
+LOG_COMPACT_THRESHOLD = 1024 * 1024
+TABLE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+WAL_CHECKPOINT_BYTES = 4 * 1024 * 1024
+
+_table_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_table_cache_bytes = 0
+_lock_state: Dict[str, Any] = {"file": None, "exclusive": False, "depth": 0}
+_transaction: Optional[Dict[str, Any]] = None
+_metadata_state: Dict[str, Any] = {"data": None, "stamp": None, "text": None}
+_checkpoint_hooks: List[Callable[[], None]] = []
+
+
+def _metadata_file() -> Path:
+    return Path("data") / "metadata.json"
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _dump_metadata(metadata: Dict[str, Any]) -> str:
+    return json.dumps(metadata, indent=2, ensure_ascii=False)
 
 
 def load_metadata() -> Dict[str, Any]:
-    metadata_file = Path("data") / "metadata.json"
+    if _transaction is not None and _transaction["metadata"] is not None:
+        return copy.deepcopy(_transaction["metadata"])
+
+    metadata_file = _metadata_file()
+    stamp = _file_stamp(metadata_file)
+    if _metadata_state["data"] is not None and _metadata_state["stamp"] == stamp:
+        return _metadata_state["data"]
 
-    if metadata_file.exists():
+    data = {}
+    if stamp is not None:
         try:
             with open(metadata_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data is None:
-                    return {}
-                return data
+                data = json.load(f) or {}
         except (json.JSONDecodeError, IOError):
-            return {}
+            data = {}
+
+    _metadata_state.update(data=data, stamp=stamp, text=_dump_metadata(data))
+    return data
+
 
-    return {}
+def refresh_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    if _transaction is not None:
+        return metadata
+    if _metadata_state["stamp"] == _file_stamp(_metadata_file()):
+        if _metadata_state["data"] is not metadata:
+            _metadata_state["data"] = metadata
+        return metadata
+
+    fresh = load_metadata()
+    metadata.clear()
+    metadata.update(fresh)
+    _metadata_state["data"] = metadata
+    return metadata
 
 
 def save_metadata(metadata: Dict[str, Any]) -> None:
     if metadata is None:
         raise ValueError("Нельзя сохранять None в качестве метаданных")
 
+    if _transaction is not None:
+        _transaction["metadata"] = copy.deepcopy(metadata)
+        return
+
+    text = _dump_metadata(metadata)
+    unchanged = (
+        text == _metadata_state["text"]
+        and _metadata_state["stamp"] == _file_stamp(_metadata_file())
+    )
+    if unchanged:
+        _metadata_state["data"] = metadata
+        return
+
+    log_change({"op": "metadata", "metadata": metadata})
+    _write_metadata(metadata, text)
+
+
+def _write_metadata(metadata: Dict[str, Any], text: Optional[str] = None) -> None:
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
 
-    metadata_file = data_dir / "metadata.json"
-    with open(metadata_file, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    if text is None:
+        text = _dump_metadata(metadata)
+
+    metadata_file = _metadata_file()
+    tmp_file = _temp_file(metadata_file)
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    _replace_file(tmp_file, metadata_file)
+    _metadata_state.update(
+        data=metadata, stamp=_file_stamp(metadata_file), text=text
+    )
+
+
+def _temp_file(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+def write_file_atomic(path: Path, text: str) -> None:
+    tmp_file = _temp_file(path)
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
+def _replace_file(tmp_file: Path, path: Path) -> None:
+    wal.commit()
+    wal.fsync_path(tmp_file)
+    os.replace(tmp_file, path)
+    wal.fsync_path(path.parent)
+
+
+@contextmanager
+def database_lock(exclusive: bool = False) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+
+    state = _lock_state
+    if state["depth"] and (state["exclusive"] or not exclusive):
+        state["depth"] += 1
+        try:
+            yield
+        finally:
+            state["depth"] -= 1
+        return
+
+    if state["file"] is None:
+        data_dir = Path("data")
+        data_dir.mkdir(exist_ok=True)
+        state["file"] = open(data_dir / ".lock", 'a')
+
+    upgrade = state["depth"] > 0
+    fd = state["file"].fileno()
+    fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    state["exclusive"] = exclusive
+    state["depth"] += 1
+    try:
+        yield
+    finally:
+        state["depth"] -= 1
+        if upgrade:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            state["exclusive"] = False
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _next_id_file(table_name: str) -> Path:
+    return Path("data") / f"{table_name}.next_id"
+
+
+def load_next_id(table_name: str) -> int:
+    try:
+        return int(_next_id_file(table_name).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return 1
+
+
+def save_next_id(table_name: str, next_id: int) -> None:
+    Path("data").mkdir(exist_ok=True)
+    write_file_atomic(_next_id_file(table_name), str(next_id))
+
+
+def drop_next_id(table_name: str) -> None:
+    next_id_file = _next_id_file(table_name)
+    if next_id_file.exists():
+        next_id_file.unlink()
+
+
+def holds_shared_lock() -> bool:
+    return _lock_state["depth"] > 0 and not _lock_state["exclusive"]
+
+
+def log_change(change: Dict[str, Any]) -> None:
+    if _transaction is not None:
+        _transaction["changes"].append(copy.deepcopy(change))
+        return
+    wal.append(change)
+
+
+def in_transaction() -> bool:
+    return _transaction is not None
+
+
+def start_transaction(metadata: Dict[str, Any]) -> None:
+    global _transaction
+    if _transaction is not None:
+        raise ValueError("Транзакция уже начата")
+
+    _transaction = {
+        "original_metadata": copy.deepcopy(metadata),
+        "metadata": None,
+        "metadata_stamp": _file_stamp(_metadata_file()),
+        "tables": {},
+        "stamps": {},
+        "dirty": set(),
+        "changes": [],
+    }
+
+
+def transaction_conflicts() -> List[str]:
+    if _transaction is None:
+        return []
+
+    conflicts = [
+        table_name for table_name, stamp in _transaction["stamps"].items()
+        if get_table_files_stamp(table_name) != stamp
+    ]
+    if _transaction["metadata_stamp"] != _file_stamp(_metadata_file()):
+        conflicts.append("metadata.json")
+    return conflicts
+
+
+def _end_transaction() -> Dict[str, Any]:
+    global _transaction
+    if _transaction is None:
+        raise ValueError("Нет активной транзакции")
+
+    transaction, _transaction = _transaction, None
+    return transaction
+
+
+def finish_transaction() -> List[str]:
+    transaction = _end_transaction()
+    metadata = transaction["metadata"]
+
+    for change in transaction["changes"]:
+        wal.append(change)
+    if metadata is not None:
+        wal.append({"op": "metadata", "metadata": metadata})
+    wal.commit()
+
+    for table_name in transaction["dirty"]:
+        save_table_data(table_name, transaction["tables"][table_name])
+    if metadata is not None:
+        _write_metadata(metadata)
+    return list(transaction["tables"])
+
+
+def abort_transaction() -> Tuple[List[str], Dict[str, Any]]:
+    transaction = _end_transaction()
+    return list(transaction["tables"]), transaction["original_metadata"]
+
+
+def commit_changes() -> None:
+    wal.commit()
+    if wal.size() >= WAL_CHECKPOINT_BYTES:
+        checkpoint()
+
+
+def _flush_metadata() -> None:
+    metadata = _metadata_state["data"]
+    if metadata is None or _transaction is not None:
+        return
+    if _metadata_state["stamp"] != _file_stamp(_metadata_file()):
+        return
+
+    text = _dump_metadata(metadata)
+    if text != _metadata_state["text"]:
+        _write_metadata(metadata, text)
+
+
+def register_checkpoint_hook(hook: Callable[[], None]) -> None:
+    _checkpoint_hooks.append(hook)
+
+
+def checkpoint() -> None:
+    with database_lock(exclusive=True):
+        for hook in _checkpoint_hooks:
+            hook()
+        _flush_metadata()
+        wal.commit()
+        data_dir = Path("data")
+        if data_dir.exists():
+            for path in data_dir.iterdir():
+                if path.is_file() and path.name != ".lock":
+                    wal.fsync_path(path)
+            wal.fsync_path(data_dir)
+        wal.reset()
+
+
+def _apply_change(data: List[Dict[str, Any]], change: Dict[str, Any]) -> None:
+    op = change["op"]
+    key = change.get("key")
+
+    if op == "replace":
+        data[:] = change["records"]
+    elif "positions" in change:
+        for position, record in zip(
+            change["positions"], change["records"], strict=True
+        ):
+            data[position:position + 1] = [record]
+    elif op == "insert":
+        present = {record.get(key) for record in data}
+        data.extend(
+            record for record in change["records"]
+            if record.get(key) not in present
+        )
+    elif op == "update":
+        updated = {record.get(key): record for record in change["records"]}
+        for position, record in enumerate(data):
+            if record.get(key) in updated:
+                data[position] = updated[record.get(key)]
+    elif op == "delete":
+        deleted = set(change["ids"])
+        data[:] = [record for record in data if record.get(key) not in deleted]
+
+
+def _unique_records(
+    data: List[Dict[str, Any]],
+    key: Optional[str],
+) -> List[Dict[str, Any]]:
+    if key is None:
+        return list(data)
+
+    seen = set()
+    unique = []
+    for record in data:
+        if record.get(key) not in seen:
+            seen.add(record.get(key))
+            unique.append(record)
+    return unique
+
+
+def _recovery_base(
+    table_name: str,
+    first_change: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    try:
+        return load_table_data(table_name)
+    except Exception as e:
+        if first_change["op"] != "create":
+            raise ValueError(
+                f"Файл таблицы '{table_name}' не читается, а журнал не содержит "
+                f"всех её изменений: {e}"
+            ) from e
+
+    invalidate_table_cache(table_name)
+    return []
+
+
+def recover_from_wal() -> int:
+    with database_lock(exclusive=True):
+        return _recover_from_wal()
+
+
+def _recover_from_wal() -> int:
+    data_dir = Path("data")
+    data_dir.mkdir(exist_ok=True)
+    for tmp_file in data_dir.glob("*.tmp*"):
+        tmp_file.unlink()
+
+    changes = wal.read_changes()
+    if not changes:
+        wal.reset()
+        return 0
+
+    metadata = load_metadata()
+    tables: Dict[str, List[Dict[str, Any]]] = {}
+    next_ids: Dict[str, int] = {}
+    for change in changes:
+        if change["op"] == "metadata":
+            metadata = change["metadata"]
+            continue
+
+        table_name = change["table"]
+        if "next_id" in change:
+            next_ids[table_name] = max(
+                next_ids.get(table_name, 1), change["next_id"]
+            )
+        if table_name not in tables:
+            tables[table_name] = _unique_records(
+                _recovery_base(table_name, change), change.get("key")
+            )
+        _apply_change(tables[table_name], change)
+
+    for table_name, data in tables.items():
+        if table_name in metadata:
+            save_table_data(table_name, data)
+    for table_name, next_id in next_ids.items():
+        if table_name in metadata and next_id > load_next_id(table_name):
+            save_next_id(table_name, next_id)
+    _write_metadata(metadata)
+    checkpoint()
+    return len(changes)
+
+
+STORAGE_SUFFIXES = {"columnar": ".col", "rows": ".rows", "json": ".json"}
+
+
+def _snapshot_file(table_name: str) -> Path:
+    for suffix in (".col", ".rows"):
+        snapshot_file = Path("data") / f"{table_name}{suffix}"
+        if snapshot_file.exists():
+            return snapshot_file
+    return Path("data") / f"{table_name}.json"
+
+
+def is_columnar_table(table_name: str) -> bool:
+    return _snapshot_file(table_name).suffix == ".col"
+
+
+def is_mapped_table(table_name: str) -> bool:
+    return _snapshot_file(table_name).suffix == ".rows"
+
+
+def get_table_files_stamp(table_name: str) -> Tuple[Optional[Tuple[int, int]], ...]:
+    return (
+        _file_stamp(_snapshot_file(table_name)),
+        _file_stamp(Path("data") / f"{table_name}.log.jsonl"),
+    )
+
+
+def _cache_table(
+    table_name: str,
+    data: List[Dict[str, Any]],
+    stamp: Tuple[Optional[Tuple[int, int]], ...],
+) -> None:
+    global _table_cache_bytes
+
+    invalidate_table_cache(table_name)
+    size = sum(part[1] for part in stamp if part)
+    if size > TABLE_CACHE_MAX_BYTES:
+        return
+
+    _table_cache[table_name] = {"data": data, "stamp": stamp, "size": size}
+    _table_cache_bytes += size
+
+    while _table_cache_bytes > TABLE_CACHE_MAX_BYTES:
+        _, evicted = _table_cache.popitem(last=False)
+        _table_cache_bytes -= evicted["size"]
+
+
+def invalidate_table_cache(table_name: Optional[str] = None) -> None:
+    global _table_cache_bytes
+
+    if table_name is None:
+        _table_cache.clear()
+        _table_cache_bytes = 0
+        return
+
+    entry = _table_cache.pop(table_name, None)
+    if entry is not None:
+        _table_cache_bytes -= entry["size"]
+
+
+def peek_table_cache(table_name: str) -> Optional[List[Dict[str, Any]]]:
+    if _transaction is not None and table_name in _transaction["tables"]:
+        return _transaction["tables"][table_name]
+
+    cached = _table_cache.get(table_name)
+    if cached is not None and cached["stamp"] == get_table_files_stamp(table_name):
+        return cached["data"]
+    return None
 
 
 def load_table_data(table_name: str) -> List[Dict[str, Any]]:
+    if _transaction is None:
+        return _read_table_data(table_name)
+
+    tables = _transaction["tables"]
+    if table_name not in tables:
+        _transaction["stamps"][table_name] = get_table_files_stamp(table_name)
+        data = _read_table_data(table_name)
+        tables[table_name] = [dict(record) for record in data]
+    return tables[table_name]
+
+
+def _read_table_data(table_name: str) -> List[Dict[str, Any]]:
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
 
-    data_file = data_dir / f"{table_name}.json"
-    if data_file.exists():
+    stamp = get_table_files_stamp(table_name)
+    cached = _table_cache.get(table_name)
+    if cached is not None and cached["stamp"] == stamp:
+        _table_cache.move_to_end(table_name)
+        metrics.increment("table_cache_hits_total", table=table_name)
+        return cached["data"]
+
+    metrics.increment("table_cache_misses_total", table=table_name)
+    metrics.increment(
+        "table_bytes_read_total",
+        sum(part[1] for part in stamp if part),
+        table=table_name,
+    )
+    data = _parse_table_data(table_name)
+    _cache_table(table_name, data, stamp)
+    return data
+
+
+def _parse_table_data(table_name: str) -> List[Dict[str, Any]]:
+    data_file = _snapshot_file(table_name)
+    data = []
+    if data_file.suffix == ".col":
+        data = columnar.read_rows(data_file)
+    elif data_file.suffix == ".rows":
+        data = rowstore.read_rows(data_file)
+    elif data_file.exists():
         try:
             with open(data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Файл таблицы '{data_file}' повреждён: {e}") from e
 
-    return []
+    data.extend(replay_table_log(table_name))
+    return data
+
+
+def open_table_view(table_name: str) -> rowstore.MappedRows:
+    return rowstore.MappedRows(
+        _snapshot_file(table_name), replay_table_log(table_name)
+    )
+
+
+def table_column_bytes(table_name: str, columns: Iterable[str]) -> int:
+    if not is_columnar_table(table_name):
+        return 0
+    log_stamp = get_table_files_stamp(table_name)[1]
+    return columnar.column_bytes(_snapshot_file(table_name), columns) + (
+        log_stamp[1] if log_stamp else 0
+    )
+
+
+def load_table_columns(
+    table_name: str,
+    columns: Iterable[str],
+) -> Optional[Dict[str, List[Any]]]:
+    if not is_columnar_table(table_name):
+        return None
+
+    columns = list(columns)
+    if metrics.enabled():
+        metrics.increment(
+            "table_bytes_read_total",
+            table_column_bytes(table_name, columns),
+            table=table_name,
+        )
+    rows, result = columnar.read_columns(_snapshot_file(table_name), columns)
+    for name in columns:
+        result.setdefault(name, [""] * rows)
+
+    for record in replay_table_log(table_name):
+        for name in columns:
+            result[name].append(record.get(name, ""))
+    return result
+
+
+def load_table_rows(
+    table_name: str,
+    positions: List[int],
+) -> List[Dict[str, Any]]:
+    if not is_columnar_table(table_name):
+        data = load_table_data(table_name)
+        return [data[position] for position in positions]
+
+    rows = columnar.read_header(_snapshot_file(table_name))["rows"]
+    snapshot_positions = [position for position in positions if position < rows]
+    result = columnar.read_rows(_snapshot_file(table_name), snapshot_positions)
+
+    snapshot_stamp, log_stamp = get_table_files_stamp(table_name)
+    read_bytes = snapshot_stamp[1] if snapshot_stamp else 0
+    if len(snapshot_positions) < len(positions) and log_stamp:
+        read_bytes += log_stamp[1]
+    metrics.increment("table_bytes_read_total", read_bytes, table=table_name)
+
+    if len(snapshot_positions) < len(positions):
+        log_records = replay_table_log(table_name)
+        for position in positions[len(snapshot_positions):]:
+            result.append(log_records[position - rows])
+    return result
+
+
+def count_table_rows(table_name: str, cache: bool = True) -> int:
+    cached = peek_table_cache(table_name)
+    if cached is not None:
+        return len(cached)
+
+    if is_columnar_table(table_name):
+        rows = columnar.read_header(_snapshot_file(table_name))["rows"]
+        return rows + len(replay_table_log(table_name))
+
+    if is_mapped_table(table_name):
+        view = open_table_view(table_name)
+        try:
+            return len(view)
+        finally:
+            view.close()
+
+    if not cache:
+        return len(_parse_table_data(table_name))
+    return len(load_table_data(table_name))
+
+
+def replay_table_log(table_name: str) -> List[Dict[str, Any]]:
+    log_file = Path("data") / f"{table_name}.log.jsonl"
+    records = []
+    if not log_file.exists():
+        return records
+
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+
+    return records
+
+
+def append_table_record(table_name: str, record: Dict[str, Any]) -> None:
+    append_table_records(table_name, [record])
+
+
+def append_table_records(
+    table_name: str,
+    records: List[Dict[str, Any]],
+) -> None:
+    if _transaction is not None:
+        load_table_data(table_name).extend(records)
+        _transaction["dirty"].add(table_name)
+        return
+
+    data_dir = Path("data")
+    data_dir.mkdir(exist_ok=True)
+
+    lines = "".join(
+        json.dumps(record, ensure_ascii=False) + "\n" for record in records
+    )
+    if len(lines) >= LOG_COMPACT_THRESHOLD:
+        data = load_table_data(table_name)
+        data.extend(records)
+        save_table_data(table_name, data)
+        return
+
+    stamp = get_table_files_stamp(table_name)
+    cached = _table_cache.get(table_name)
+
+    log_file = data_dir / f"{table_name}.log.jsonl"
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(lines)
+    log_size = log_file.stat().st_size
+    metrics.increment(
+        "table_bytes_written_total",
+        log_size - (stamp[1][1] if stamp[1] else 0),
+        table=table_name,
+    )
+
+    if cached is not None and cached["stamp"] == stamp:
+        cached["data"].extend(records)
+        _cache_table(table_name, cached["data"], get_table_files_stamp(table_name))
+    else:
+        invalidate_table_cache(table_name)
+
+    if log_size >= LOG_COMPACT_THRESHOLD:
+        compact_table_log(table_name)
+
+
+def compact_table_log(table_name: str) -> None:
+    log_file = Path("data") / f"{table_name}.log.jsonl"
+    if not log_file.exists():
+        return
+
+    save_table_data(table_name, load_table_data(table_name))
 
 
 def save_table_data(table_name: str, data: List[Dict[str, Any]]) -> None:
+    if _transaction is not None:
+        _transaction["tables"][table_name] = data
+        _transaction["dirty"].add(table_name)
+        return
+
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
 
-    data_file = data_dir / f"{table_name}.json"
-    with open(data_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    data_file = _snapshot_file(table_name)
+    column_types = None
+    if data_file.suffix == ".col":
+        column_types = columnar.column_types(data_file)
+    _write_snapshot(data_file, data, column_types)
 
+    log_file = data_dir / f"{table_name}.log.jsonl"
+    if log_file.exists():
+        log_file.unlink()
 
-def convert_to_type(value: str, target_type: str) -> Any:
-    target_type = target_type.lower()
-
-    if target_type == "int":
-        return int(value)
-    elif target_type == "float":
-        return float(value)
-    elif target_type == "bool":
-        return value.lower() in ("true", "1", "yes", "да")
-    elif target_type == "str":
-        return str(value).strip("'\"")
+    stamp = get_table_files_stamp(table_name)
+    metrics.increment(
+        "table_bytes_written_total",
+        stamp[0][1] if stamp[0] else 0,
+        table=table_name,
+    )
+    _cache_table(table_name, data, stamp)
+
+
+def _write_snapshot(
+    data_file: Path,
+    data: List[Dict[str, Any]],
+    column_types: Optional[List[Tuple[str, str]]] = None,
+) -> None:
+    tmp_file = _temp_file(data_file)
+    if data_file.suffix == ".col":
+        columnar.write_table(tmp_file, data, column_types or [])
+    elif data_file.suffix == ".rows":
+        rowstore.write_table(tmp_file, data)
+        _replace_file(
+            rowstore.offsets_file(tmp_file), rowstore.offsets_file(data_file)
+        )
     else:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    _replace_file(tmp_file, data_file)
+
+
+def set_table_storage(
+    table_name: str,
+    storage: str,
+    column_types: List[Tuple[str, str]],
+) -> None:
+    if storage not in STORAGE_SUFFIXES:
+        raise ValueError(f"Неизвестный формат хранения: {storage}")
+
+    data = load_table_data(table_name)
+    data_dir = Path("data")
+    target_file = data_dir / f"{table_name}{STORAGE_SUFFIXES[storage]}"
+    _write_snapshot(target_file, data, column_types)
+
+    for suffix in STORAGE_SUFFIXES.values():
+        snapshot_file = data_dir / f"{table_name}{suffix}"
+        if snapshot_file != target_file and snapshot_file.exists():
+            snapshot_file.unlink()
+    offsets_file = rowstore.offsets_file(data_dir / f"{table_name}.rows")
+    if storage != "rows" and offsets_file.exists():
+        offsets_file.unlink()
+
+    log_file = data_dir / f"{table_name}.log.jsonl"
+    if log_file.exists():
+        log_file.unlink()
+
+    _cache_table(table_name, data, get_table_files_stamp(table_name))
+
+
+_TRUE_VALUES = ("true", "1", "yes", "да")
+
+
+def _convert_bool(value: str) -> bool:
+    return value.lower() in _TRUE_VALUES
+
+
+def _convert_str(value: str) -> str:
+    return str(value).strip("'\"")
+
+
+_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "int": int,
+    "float": float,
+    "bool": _convert_bool,
+    "str": _convert_str,
+}
+
+
+def get_converter(target_type: str) -> Callable[[str], Any]:
+    converter = _CONVERTERS.get(target_type.lower())
+    if converter is not None:
+        return converter
+
+    def unknown_type(value: str) -> Any:
         raise ValueError(f"Неизвестный тип: {target_type}")
 
+    return unknown_type
+
+
+def convert_to_type(value: str, target_type: str) -> Any:
+    return get_converter(target_type)(value)
+
 
 def validate_data_type(value: str, expected_type: str) -> bool:
     try:
@@ -0,0 +1,95 @@
+import atexit
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+_wal_file: Optional[TextIO] = None
+_pending = False
+
+
+def wal_path() -> Path:
+    return Path("data") / "wal.jsonl"
+
+
+def fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _is_current(f: TextIO) -> bool:
+    try:
+        current = os.stat(wal_path())
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(f.fileno())
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+def append(change: Dict[str, Any]) -> None:
+    global _wal_file, _pending
+    if _wal_file is not None and not _is_current(_wal_file):
+        commit()
+        _wal_file.close()
+        _wal_file = None
+
+    if _wal_file is None:
+        Path("data").mkdir(exist_ok=True)
+        _wal_file = open(wal_path(), 'a', encoding='utf-8')
+
+    _wal_file.write(json.dumps(change, ensure_ascii=False) + "\n")
+    _wal_file.flush()
+    _pending = True
+
+
+def commit() -> None:
+    global _pending
+    if _wal_file is None or not _pending:
+        return
+
+    os.fsync(_wal_file.fileno())
+    _pending = False
+
+
+def size() -> int:
+    if _wal_file is not None:
+        return os.fstat(_wal_file.fileno()).st_size
+    path = wal_path()
+    return path.stat().st_size if path.exists() else 0
+
+
+def read_changes() -> List[Dict[str, Any]]:
+    path = wal_path()
+    changes = []
+    if not path.exists():
+        return changes
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            try:
+                changes.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+
+    return changes
+
+
+def reset() -> None:
+    global _wal_file, _pending
+    if _wal_file is not None:
+        _wal_file.close()
+        _wal_file = None
+    _pending = False
+
+    path = wal_path()
+    if path.exists():
+        path.unlink()
+        fsync_path(path.parent)
+
+
+atexit.register(commit)
@@ -0,0 +1,47 @@
+import pytest
+
+from database_cli import core, indexes, schema, stats, utils, wal
+from database_cli.decorators import set_auto_confirm
+
+
+def _reset_process_state() -> None:
+    utils.invalidate_table_cache()
+    utils._metadata_state.update(data=None, stamp=None, text=None)
+    schema.invalidate_schema()
+    core.clear_cache()
+    core._next_ids.clear()
+    indexes._index_cache.clear()
+    stats._stats_cache.clear()
+    stats._dirty_tables.clear()
+
+
+@pytest.fixture(autouse=True)
+def database_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    set_auto_confirm(True)
+    _reset_process_state()
+    yield tmp_path
+    if utils.in_transaction():
+        utils.abort_transaction()
+    wal.reset()
+    set_auto_confirm(False)
+
+
+@pytest.fixture
+def restart():
+    def restart_database():
+        if utils.in_transaction():
+            utils.abort_transaction()
+        _reset_process_state()
+        utils.recover_from_wal()
+        return utils.load_metadata()
+
+    return restart_database
+
+
+@pytest.fixture
+def metadata():
+    metadata = utils.load_metadata()
+    core.create_table(metadata, "users", ["name str", "age int"])
+    utils.save_metadata(metadata)
+    return metadata
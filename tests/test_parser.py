@@ -0,0 +1,79 @@
+import pytest
+
+from database_cli.parser import (
+    is_aggregate_select,
+    parse_select,
+    parse_update,
+    parse_where,
+)
+from database_cli.predicates import compile_predicate
+from database_cli.schema import get_schema
+
+SCHEMA = get_schema("users", {"columns": ["ID int", "name str", "age int"]})
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("age = 30", ("=", "age", "30")),
+        ("age <> 30", ("!=", "age", "30")),
+        ('name = "Иван Петров"', ("=", "name", "Иван Петров")),
+        ("name = 'a and b'", ("=", "name", "a and b")),
+        ("age in (1, 2, 3)", ("in", "age", ["1", "2", "3"])),
+        ("age between 18 and 30", ("between", "age", "18", "30")),
+        (
+            "age > 1 and age < 5 or name = x",
+            ("or", ("and", (">", "age", "1"), ("<", "age", "5")), ("=", "name", "x")),
+        ),
+        (
+            "age > 1 and (age < 5 or name = x)",
+            ("and", (">", "age", "1"), ("or", ("<", "age", "5"), ("=", "name", "x"))),
+        ),
+    ],
+)
+def test_parse_where(text, expected):
+    assert parse_where(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "age =", "(age = 1", "age = 1)", "and"])
+def test_parse_where_rejects_malformed(text):
+    with pytest.raises(ValueError):
+        parse_where(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "record", "expected"),
+    [
+        ("age >= 18", {"age": 18}, True),
+        ("age > 18", {"age": 18}, False),
+        ("age between 18 and 30", {"age": 30}, True),
+        ("age in (1, 2)", {"age": 3}, False),
+        ("name = x or age = 5", {"name": "y", "age": 5}, True),
+        ("name = x and age = 5", {"name": "y", "age": 5}, False),
+        ("name != x", {"name": "y"}, True),
+    ],
+)
+def test_compiled_predicate(text, record, expected):
+    predicate = compile_predicate(parse_where(text), SCHEMA)
+    assert predicate(record) is expected
+
+
+def test_compiled_predicate_rejects_bad_value():
+    with pytest.raises(ValueError):
+        compile_predicate(parse_where("age = abc"), SCHEMA)
+
+
+def test_parse_update_ignores_where_inside_quotes():
+    table_name, set_clause, where = parse_update(
+        'update users set name = "a where b", age = 1 where ID = 2'
+    )
+    assert table_name == "users"
+    assert set_clause == {"name": '"a where b"', "age": "1"}
+    assert where == ("=", "ID", "2")
+
+
+def test_parse_select_rejects_projection():
+    assert not is_aggregate_select("select name from users")
+    assert is_aggregate_select("select count(*) from users")
+    with pytest.raises(ValueError, match="отдельных столбцов"):
+        parse_select("select name from users")
@@ -0,0 +1,111 @@
+import shutil
+
+from database_cli import core, utils
+from database_cli.parser import parse_where
+
+
+def _rows(metadata, table_name="users"):
+    return [
+        (record["ID"], record["name"], record["age"])
+        for record in core.select(metadata, table_name)
+    ]
+
+
+def _insert(metadata, *rows):
+    return core.insert_many(metadata, "users", [list(row) for row in rows])["ids"]
+
+
+def test_insert_assigns_increasing_ids(metadata):
+    assert _insert(metadata, ("a", "1"), ("b", "2")) == [1, 2]
+    assert _insert(metadata, ("c", "3")) == [3]
+
+
+def test_deleted_max_id_is_not_reused(metadata, restart):
+    _insert(metadata, ("a", "1"), ("b", "2"), ("c", "3"))
+    core.delete(metadata, "users", parse_where("ID = 3"))
+    assert _insert(metadata, ("d", "4")) == [4]
+
+    core.delete(metadata, "users", parse_where("ID = 4"))
+    utils.commit_changes()
+    metadata = restart()
+    assert _insert(metadata, ("e", "5")) == [5]
+
+
+def test_next_id_survives_lost_sidecar(metadata, restart, database_dir):
+    _insert(metadata, ("a", "1"), ("b", "2"))
+    core.delete(metadata, "users", parse_where("ID = 2"))
+    utils.commit_changes()
+    (database_dir / "data" / "users.next_id").unlink()
+
+    metadata = restart()
+    assert _insert(metadata, ("c", "3")) == [3]
+
+
+def test_recovery_replays_wal_over_lost_table_files(metadata, restart, database_dir):
+    _insert(metadata, ("a", "1"))
+    utils.checkpoint()
+    data_dir = database_dir / "data"
+    saved = database_dir / "saved"
+    shutil.copytree(data_dir, saved)
+
+    _insert(metadata, ("b", "2"), ("c", "3"))
+    core.update(metadata, "users", {"age": "20"}, parse_where("name = b"))
+    core.delete(metadata, "users", parse_where("ID = 1"))
+    utils.commit_changes()
+
+    wal_file = data_dir / "wal.jsonl"
+    for path in data_dir.iterdir():
+        if path != wal_file:
+            path.unlink()
+    for path in saved.iterdir():
+        shutil.copy2(path, data_dir / path.name)
+
+    metadata = restart()
+    assert _rows(metadata) == [(2, "b", 20), (3, "c", 3)]
+    assert not wal_file.exists()
+    assert _insert(metadata, ("d", "4")) == [4]
+
+
+def test_recovery_ignores_torn_wal_tail(metadata, restart, database_dir):
+    _insert(metadata, ("a", "1"))
+    utils.commit_changes()
+    with open(database_dir / "data" / "wal.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"table": "users", "op": "insert", "rec')
+
+    metadata = restart()
+    assert _rows(metadata) == [(1, "a", 1)]
+
+
+def test_commit_keeps_transaction_changes(metadata, restart):
+    _insert(metadata, ("a", "1"))
+    core.begin(metadata)
+    _insert(metadata, ("b", "2"))
+    core.update(metadata, "users", {"age": "10"}, parse_where("ID = 1"))
+    assert core.commit(metadata) == ["users"]
+    utils.commit_changes()
+
+    metadata = restart()
+    assert _rows(metadata) == [(1, "a", 10), (2, "b", 2)]
+
+
+def test_rollback_discards_transaction_changes(metadata, restart):
+    _insert(metadata, ("a", "1"))
+    core.begin(metadata)
+    _insert(metadata, ("b", "2"))
+    core.delete(metadata, "users", parse_where("ID = 1"))
+    assert _rows(metadata) == [(2, "b", 2)]
+
+    core.rollback(metadata)
+    assert _rows(metadata) == [(1, "a", 1)]
+    utils.commit_changes()
+
+    metadata = restart()
+    assert _rows(metadata) == [(1, "a", 1)]
+
+
+def test_rollback_discards_created_table(metadata):
+    core.begin(metadata)
+    core.create_table(metadata, "orders", ["total int"])
+    utils.save_metadata(metadata)
+    core.rollback(metadata)
+    assert "orders" not in metadata